@@ -0,0 +1,148 @@
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+
+from tictactoe.agent import Qlearner, SARSAlearner
+from tictactoe.engine import benchmark, evaluate_perfect, self_play_game, teach
+from tictactoe.game import Game
+from tictactoe.seeding import seed_all
+from tictactoe.board import WINNING
+from tictactoe.state import BOARDS, LEGAL, PIECES
+from tictactoe.teacher import Teacher
+
+
+def time_call(fn, number, repeat=5):
+    """ Best time per call over 'repeat' rounds of 'number' calls. """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def sample_states(count):
+    """ Random states with 'X' to move and the game still going, as (state index, board) pairs. """
+    weights, winning = 1 << np.arange(9), np.array(WINNING)
+    o_bits = ((BOARDS == PIECES['O']) * weights).sum(axis=1)
+    x_bits = ((BOARDS == PIECES['X']) * weights).sum(axis=1)
+    n_o, n_x = (BOARDS == PIECES['O']).sum(axis=1), (BOARDS == PIECES['X']).sum(axis=1)
+    states = np.flatnonzero(LEGAL.any(axis=1) & ~winning[o_bits] & ~winning[x_bits]
+                            & ((n_o == n_x) | (n_o == n_x + 1)))
+    chosen = np.random.choice(states, count)
+    marks = np.array(['-', 'O', 'X'])
+    return [(int(s), marks[BOARDS[s]].reshape(3, 3).tolist()) for s in chosen]
+
+
+def micro_benchmarks(number):
+    """ Per-call time of the hot functions, in microseconds. """
+    agent = Qlearner(0.5, 0.9, 0.1)
+    teach(agent, Teacher(), 2000)
+    states = sample_states(256)
+    keys = np.array([s for s, _ in states])
+    teacher, perfect_teacher = Teacher(0.9), Teacher(1., perfect=True)
+    game = Game(agent, teacher)
+    game.bits = {'O': 0b000010101, 'X': 0b101000000}
+    cycle = iter(range(10**12))
+
+    def pick():
+        return states[next(cycle) % len(states)]
+
+    calls = {
+        'Learner.get_action': lambda: agent.get_action(pick()[0]),
+        'Learner.get_actions/state': lambda: agent.get_actions(keys),
+        'Learner.update': lambda: agent.update(0, 1, (0, 0), (0, 1), 0),
+        'Teacher.makeMove': lambda: teacher.makeMove(*reversed(pick())),
+        'Teacher.makeMove(perfect)': lambda: perfect_teacher.makeMove(*reversed(pick())),
+        'Game.checkForEnd': lambda: game.checkForEnd('O'),
+    }
+    results = {}
+    for name, fn in calls.items():
+        seconds = time_call(fn, number)
+        if name.endswith('/state'):
+            seconds /= len(keys)
+        results[name] = {'value': 1e6 * seconds, 'unit': 'us/call', 'higher_is_better': False}
+    return results
+
+
+def throughput(episodes):
+    """ Games per second of the training and evaluation loops. """
+    results = {}
+    for name, cls in [('q', Qlearner), ('sarsa', SARSAlearner)]:
+        rates = benchmark(lambda: cls(0.5, 0.9, 0.1), Teacher(), episodes)
+        results['teach_games_per_s[%s]' % name] = rates['engine']
+        results['game_loop_games_per_s[%s]' % name] = rates['game_loop']
+
+    agents = [Qlearner(0.5, 0.9, 0.1), Qlearner(0.5, 0.9, 0.1)]
+    start = time.perf_counter()
+    for _ in range(episodes):
+        self_play_game(agents)
+    results['self_play_games_per_s'] = episodes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    evaluate_perfect(agents[0], 10 * episodes)
+    results['evaluate_perfect_games_per_s'] = 10 * episodes / (time.perf_counter() - start)
+    return {name: {'value': rate, 'unit': 'games/s', 'higher_is_better': True}
+            for name, rate in results.items()}
+
+
+def compare(results, baseline, tolerance):
+    """ Print the change of each result against the baseline and return the regressions. """
+    regressions = []
+    print("%-32s %14s %14s %8s" % ('benchmark', 'baseline', 'current', 'change'))
+    for name, result in results.items():
+        if name not in baseline:
+            print("%-32s %14s %14.3f %8s" % (name, '-', result['value'], 'new'))
+            continue
+        old, new = baseline[name]['value'], result['value']
+        # positive change = faster
+        change = (new / old - 1.) if result['higher_is_better'] else (old / new - 1.)
+        flag = ''
+        if change < -tolerance:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        print("%-32s %14.3f %14.3f %+7.1f%%%s" % (name, old, new, 100 * change, flag))
+    return regressions
+
+
+if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Time the tic-tac-toe hot paths and "
+                                                 "compare them against a saved baseline.")
+    parser.add_argument("--number", type=int, default=2000,
+                        help="calls per round of the micro-benchmarks")
+    parser.add_argument("-t", "--episodes", type=int, default=5000,
+                        help="games per throughput run")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("-o", "--out", type=str, default="benchmark_results.json")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="slowdown relative to the baseline reported as a regression")
+    args = parser.parse_args()
+
+    seed_all(args.seed)
+
+    results = micro_benchmarks(args.number)
+    results.update(throughput(args.episodes))
+
+    report = {'meta': {'seed': args.seed, 'python': platform.python_version(),
+                       'numpy': np.__version__, 'machine': platform.machine(),
+                       'time': time.strftime('%Y-%m-%d %H:%M:%S')},
+              'results': results}
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=1)
+    print("Results written to %s" % args.out)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.tolerance):
+            raise SystemExit(1)
+    else:
+        for name, result in results.items():
+            print("%-32s %14.3f %s" % (name, result['value'], result['unit']))
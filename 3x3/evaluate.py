@@ -0,0 +1,164 @@
+import argparse
+import math
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from tictactoe import solver
+from tictactoe.agent import load_agent
+from tictactoe.engine import evaluate, evaluate_perfect
+from tictactoe.seeding import seed_all, spawn_seeds
+from tictactoe.teacher import Teacher
+
+
+def wilson_interval(successes, n, z=1.96):
+    """
+    Wilson score confidence interval of a binomial rate.
+
+    Parameters
+    ----------
+    successes : int
+        number of successes
+    n : int
+        number of trials
+    z : float
+        normal quantile of the confidence level (1.96 = 95%)
+    """
+    if n == 0:
+        return 0., 1.
+    p = successes / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2*n)) / denom
+    half = z * math.sqrt(p*(1 - p)/n + z**2 / (4*n**2)) / denom
+    return max(0., center - half), min(1., center + half)
+
+
+def play_chunk(task):
+    """ Worker: play a chunk of greedy evaluation games against one opponent. """
+    agent, opponent, level, games, seed, token, agent_first = task
+    seed_all(seed)
+    if opponent == 'minimax':
+        return evaluate_perfect(agent, games, level, token, agent_first)
+    return evaluate(agent, Teacher(level), games, token, agent_first)
+
+
+def evaluate_agent(agent, levels=(0.5, 0.9, 1.0), games=1000, workers=1, minimax=True, z=1.96,
+                   seed=None, token='O', agent_first=None):
+    """
+    Evaluate an agent greedily (eps = 0, no learning) against the heuristic
+    Teacher at each ability level and, optionally, against the exact minimax
+    player. The games of each opponent are split over a process pool. Returns
+    one row per opponent with the win/draw/loss counts, rates and Wilson
+    confidence intervals.
+
+    Parameters
+    ----------
+    agent : Learner
+        agent to evaluate
+    levels : list of float
+        teacher ability levels
+    games : int
+        number of games per opponent
+    workers : int
+        number of worker processes
+    minimax : boolean
+        whether to also play the perfect (solver) player
+    z : float
+        normal quantile of the confidence intervals
+    seed : int
+        seed the game chunks are derived from (fresh entropy if None)
+    token : string
+        token the agent was trained with, 'O' or 'X' (e.g. 'X' for the
+        self-play agent2.pkl)
+    agent_first : boolean or None
+        whether the agent moves first (None = random in each game)
+    """
+    opponents = [('teacher', level) for level in levels]
+    if minimax:
+        opponents.append(('minimax', 1.))
+
+    chunks = max(1, workers)
+    seeds = iter(spawn_seeds(np.random.SeedSequence(seed), chunks * len(opponents)))
+    tasks = []
+    for opponent, level in opponents:
+        for k in range(chunks):
+            n = games // chunks + (k < games % chunks)
+            chunk_seed = next(seeds)
+            if n:
+                tasks.append((agent, opponent, level, n, chunk_seed, token, agent_first))
+    if workers > 1:
+        if minimax:
+            # build the solver table once, before the workers need it
+            solver.load_table()
+        with Pool(workers) as pool:
+            results = pool.map(play_chunk, tasks)
+    else:
+        results = [play_chunk(task) for task in tasks]
+
+    totals = {}
+    for (_, opponent, level, _, _, _, _), result in zip(tasks, results):
+        counts = totals.setdefault((opponent, level), [0, 0, 0])
+        for k in range(3):
+            counts[k] += result[k]
+
+    rows = []
+    for opponent, level in opponents:
+        counts = totals[(opponent, level)]
+        n = sum(counts)
+        row = {'opponent': opponent, 'level': level, 'games': n}
+        for name, count in zip(['win', 'draw', 'loss'], counts):
+            row[name] = count / n
+            row[name + '_ci'] = wilson_interval(count, n, z)
+        rows.append(row)
+    return rows
+
+
+def print_rows(rows):
+    print("%-8s %6s %7s   %-22s %-22s %-22s" % ('opponent', 'level', 'games', 'win', 'draw', 'loss'))
+    for row in rows:
+        cells = ["%.3f [%.3f, %.3f]" % ((row[name],) + row[name + '_ci'])
+                 for name in ['win', 'draw', 'loss']]
+        print("%-8s %6.2f %7i   %-22s %-22s %-22s" % ((row['opponent'], row['level'], row['games']) + tuple(cells)))
+
+
+if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Evaluate saved tic-tac-toe agents against "
+                                                 "the teacher and the minimax player.")
+    parser.add_argument("paths", type=str, nargs='+',
+                        help="saved agent files, e.g. q_agent.pkl agent1.pkl")
+    parser.add_argument("-l", "--levels", type=float, nargs='+', default=[0.5, 0.9, 1.0],
+                        help="teacher ability levels to evaluate against")
+    parser.add_argument("-g", "--games", type=int, default=1000,
+                        help="games played against each opponent")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no_minimax", action='store_true',
+                        help="skip the games against the minimax player")
+    parser.add_argument("-z", type=float, default=1.96,
+                        help="normal quantile of the confidence intervals (1.96 = 95%%)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the games of every agent are derived from")
+    parser.add_argument("--token", type=str, nargs='+', default=['O'], choices=['O', 'X'],
+                        help="token each agent was trained with, one for all paths or one per "
+                             "path (self-play: agent1.pkl O, agent2.pkl X)")
+    parser.add_argument("--first", type=str, nargs='+', default=['random'],
+                        choices=['random', 'agent', 'opponent'],
+                        help="who moves first, one for all paths or one per path "
+                             "(self-play: agent1.pkl agent, agent2.pkl opponent)")
+    args = parser.parse_args()
+
+    for name, values in [('--token', args.token), ('--first', args.first)]:
+        if len(values) not in (1, len(args.paths)):
+            parser.error("%s takes one value or one per path" % name)
+    tokens = args.token * len(args.paths) if len(args.token) == 1 else args.token
+    firsts = args.first * len(args.paths) if len(args.first) == 1 else args.first
+
+    for path, token, first in zip(args.paths, tokens, firsts):
+        agent = load_agent(path)
+        agent_first = {'random': None, 'agent': True, 'opponent': False}[first]
+        print("%s (%s as %s, %s first, %i Q updates)"
+              % (path, type(agent).__name__, token, first, agent.stats.updates))
+        print_rows(evaluate_agent(agent, args.levels, args.games, args.workers,
+                                  not args.no_minimax, args.z, args.seed, token, agent_first))
+        print()
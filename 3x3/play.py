@@ -1,9 +1,11 @@
 import argparse
 import os
-import pickle
 import sys
 
-from tictactoe.agent import Qlearner, SARSAlearner
+from tictactoe.agent import (Qlearner, SARSAlearner, QLambdaLearner, SARSALambdaLearner,
+                             load_agent)
+from tictactoe.engine import teach
+from tictactoe.seeding import seed_all
 from tictactoe.teacher import Teacher
 from tictactoe.game import Game
 
@@ -20,8 +22,7 @@ class GameLearning(object):
             # load an existing agent and continue training
             if not os.path.isfile(args.path):
                 raise ValueError("Cannot load agent: file does not exist.")
-            with open(args.path, 'rb') as f:
-                agent = pickle.load(f)
+            agent = load_agent(args.path)
         else:
             # check if agent state file already exists, and ask
             # user whether to overwrite if so
@@ -37,12 +38,22 @@ class GameLearning(object):
                     else:
                         print("Invalid input. Please choose 'y' or 'n'.")
             if args.agent_type == "q":
-                agent = Qlearner(alpha,gamma,epsilon)
+                agent = Qlearner(alpha,gamma,epsilon,symmetry=args.symmetry)
+            elif args.agent_type == "s":
+                agent = SARSAlearner(alpha,gamma,epsilon,symmetry=args.symmetry)
+            elif args.agent_type == "ql":
+                agent = QLambdaLearner(alpha,gamma,epsilon,symmetry=args.symmetry,lam=args.lam)
             else:
-                agent = SARSAlearner(alpha,gamma,epsilon)
+                agent = SARSALambdaLearner(alpha,gamma,epsilon,symmetry=args.symmetry,lam=args.lam)
+            # keep the result of every game next to the agent file
+            history_path = args.path + '.rewards'
+            if os.path.isfile(history_path):
+                os.remove(history_path)
+            agent.stats.history_path = history_path
 
         self.games_played = 0
         self.path = args.path
+        self.perfect_teacher = args.perfect_teacher
         self.agent = agent
 
     def beginPlaying(self):
@@ -71,15 +82,12 @@ class GameLearning(object):
 
     def beginTeaching(self, episodes):
         """ Loop through game iterations with a teaching agent. """
-        teacher = Teacher()
-        # Train for alotted number of episodes
-        while self.games_played < episodes:
-            game = Game(self.agent, teacher=teacher)
-            game.start()
-            self.games_played += 1
-            # Monitor progress
-            if self.games_played % 1000 == 0:
-                print("Games played: %i" % self.games_played)
+        teacher = Teacher(perfect=self.perfect_teacher)
+        # Train for alotted number of episodes on the headless engine,
+        # monitoring progress every 1000 games
+        if self.games_played < episodes:
+            teach(self.agent, teacher, episodes - self.games_played, log_every=1000)
+            self.games_played = episodes
         # save final agent
         self.agent.save(self.path)
 
@@ -88,24 +96,40 @@ if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe.")
     parser.add_argument('-a', "--agent_type", type=str, default="q",
-                        choices=['q', 's'],
+                        choices=['q', 's', 'ql', 'sl'],
                         help="Specify the computer agent learning algorithm. "
-                             "AGENT_TYPE='q' for Q-learning and AGENT_TYPE='s' "
-                             "for Sarsa-learning.")
+                             "AGENT_TYPE='q' for Q-learning, AGENT_TYPE='s' "
+                             "for Sarsa-learning and 'ql'/'sl' for their "
+                             "eligibility trace (lambda) versions.")
     parser.add_argument("-p", "--path", type=str, required=False,
-                        help="Specify the path for the agent pickle file. "
-                             "Defaults to q_agent.pkl for AGENT_TYPE='q' and "
-                             "sarsa_agent.pkl for AGENT_TYPE='s'.")
+                        help="Specify the path for the agent file. "
+                             "Defaults to q_agent.pkl for AGENT_TYPE='q', "
+                             "sarsa_agent.pkl for AGENT_TYPE='s', "
+                             "qlambda_agent.pkl for 'ql' and "
+                             "sarsalambda_agent.pkl for 'sl'.")
     parser.add_argument("-l", "--load", action="store_true",
                         help="whether to load trained agent")
+    parser.add_argument("-s", "--symmetry", action="store_true",
+                        help="share Q values between boards that are rotations "
+                             "or reflections of each other (new agents only)")
+    parser.add_argument("--lam", type=float, default=0.8,
+                        help="trace decay rate of the 'ql' and 'sl' agents "
+                             "(new agents only)")
     parser.add_argument("-t", "--teacher_episodes", default=None, type=int,
                         help="employ teacher agent who knows the optimal "
                              "strategy and will play for TEACHER_EPISODES games")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the agent's and teacher's random moves")
+    parser.add_argument("--perfect_teacher", action="store_true",
+                        help="make the teacher look its moves up in the exact "
+                             "minimax solver table")
     args = parser.parse_args()
+    seed_all(args.seed)
 
     # set default path
     if args.path is None:
-        args.path = 'q_agent.pkl' if args.agent_type == 'q' else 'sarsa_agent.pkl'
+        args.path = {'q': 'q_agent.pkl', 's': 'sarsa_agent.pkl', 'ql': 'qlambda_agent.pkl',
+                     'sl': 'sarsalambda_agent.pkl'}[args.agent_type]
 
     # initialize game instance
     gl = GameLearning(args)
@@ -1,10 +1,11 @@
 import argparse
 import os
-import pickle
 import sys
 import numpy as np
 import matplotlib.pylab as plt
 
+from tictactoe.agent import load_agent
+
 
 def plot_agent_reward(rewards):
     """ Function to plot agent's accumulated reward vs. iteration """
@@ -24,7 +25,12 @@ if __name__ == "__main__":
     if not os.path.isfile(args.path):
         print("Cannot load agent: file does not exist. Quitting.")
         sys.exit(0)
-    with open(args.path, 'rb') as f:
-        agent = pickle.load(f)
+    agent = load_agent(args.path)
 
-    plot_agent_reward(agent.rewards)
\ No newline at end of file
+    history = agent.stats.history()
+    if len(history) == 0:
+        print("No per-game reward history was recorded for this agent. Summary:")
+        for name, value in agent.stats.summary().items():
+            print("  %s: %s" % (name, value))
+        sys.exit(0)
+    plot_agent_reward(history)
\ No newline at end of file
@@ -1,59 +1,85 @@
 from tictactoe.agent import Qlearner, SARSAlearner
-from tictactoe.game import Game
-import pickle
+from tictactoe.engine import self_play_game
+from tictactoe.rewards import RewardTracker
+from tictactoe.seeding import seed_all, spawn_seeds
+from multiprocessing import Pool
+import argparse
+import copy
+import numpy as np
 import os
 
-def self_play(episodes=20000, alpha=0.5, gamma=0.9, eps=0.1):
-    agent1 = Qlearner(alpha, gamma, eps)
-    agent2 = Qlearner(alpha, gamma, eps)
-
-    for episode in range(1, episodes + 1):
-        # reset game
-        game = Game(agent1)
-        game2 = Game(agent2)
-
-        board = [['-','-','-'],['-','-','-'],['-','-','-']]
-        game.board = board
-        game2.board = board
-
-        turn = 0  
-
-        while True:
-            state = ''.join([''.join(r) for r in board])
-            if turn % 2 == 0:  # agent1 turn (O)
-                a = agent1.get_action(state)
-                board[a[0]][a[1]] = 'O'
-                r = game.checkForEnd('O')
-            else:              # agent2 turn (X)
-                a = agent2.get_action(state)
-                board[a[0]][a[1]] = 'X'
-                r = game2.checkForEnd('X')
-
-            if r != -1:
-                reward1 = r
-                reward2 = -r
-                agent1.update(state, None, a, None, reward1)
-                agent2.update(state, None, a, None, reward2)
-                break
-
-            turn += 1
-            new_state = ''.join([''.join(r) for r in board])
-            if turn % 2 == 1:
-                a2 = agent2.get_action(new_state)
-                agent1.update(state, new_state, a, a2, 0)
-            else:
-                a1 = agent1.get_action(new_state)
-                agent2.update(state, new_state, a, a1, 0)
-
-        # chỉ in khi đủ 1000 trận
-        if episode % 1000 == 0:
-            print(f"Self train: {episode}")
+
+def train_shard(task):
+    """ Worker: self-play a batch of episodes on local copies of the agents. """
+    agents, episodes, seed = task
+    seed_all(seed)
+    for _ in range(episodes):
+        self_play_game(agents)
+    return agents
+
+
+def shard_copy(agent):
+    """ Copy of an agent to send to a worker, with fresh reward statistics. """
+    agent = copy.copy(agent)
+    agent.stats = RewardTracker(agent.stats.window, agent.stats.ema_decay)
+    return agent
+
+
+def self_play(episodes=20000, alpha=0.5, gamma=0.9, eps=0.1, symmetry=False,
+              workers=1, sync_every=1000, seed=None):
+    seed_all(seed)
+    sequence = np.random.SeedSequence(seed)
+    agent1 = Qlearner(alpha, gamma, eps, symmetry=symmetry)
+    agent2 = Qlearner(alpha, gamma, eps, symmetry=symmetry)
+    agents = [agent1, agent2]
+    # keep the result of every game next to the agent files
+    for agent, path in zip(agents, ["agent1.pkl", "agent2.pkl"]):
+        if os.path.isfile(path + ".rewards"):
+            os.remove(path + ".rewards")
+        agent.stats.history_path = path + ".rewards"
+
+    if workers <= 1:
+        for episode in range(1, episodes + 1):
+            # agent1 (O) always moves first
+            self_play_game(agents)
+
+            # chỉ in khi đủ 1000 trận
+            if episode % 1000 == 0:
+                print(f"Self train: {episode}")
+    else:
+        # each round, every worker plays up to sync_every episodes on its own
+        # copy of the agents; the copies are then merged and sent out again
+        played = 0
+        with Pool(workers) as pool:
+            while played < episodes:
+                # split the last round so exactly 'episodes' games are played
+                remaining = min(sync_every * workers, episodes - played)
+                counts = [remaining // workers + (k < remaining % workers) for k in range(workers)]
+                tasks = [([shard_copy(a) for a in agents], n, worker_seed)
+                         for n, worker_seed in zip(counts, spawn_seeds(sequence, workers)) if n]
+                shards = pool.map(train_shard, tasks)
+                for k, agent in enumerate(agents):
+                    agent.merge([shard[k] for shard in shards])
+                played += remaining
+                print(f"Self train: {played}")
 
     # lưu file
-    with open("agent1.pkl","wb") as f: pickle.dump(agent1,f)
-    with open("agent2.pkl","wb") as f: pickle.dump(agent2,f)
+    agent1.save("agent1.pkl")
+    agent2.save("agent2.pkl")
 
     print("Self-play training complete!")
 
 if __name__ == "__main__":
-    self_play(20000)
+    parser = argparse.ArgumentParser(description="Train two Q-learning agents by self-play.")
+    parser.add_argument("-t", "--episodes", type=int, default=20000)
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes playing in parallel")
+    parser.add_argument("--sync_every", type=int, default=1000,
+                        help="episodes each worker plays between Q-table merges")
+    parser.add_argument("-s", "--symmetry", action="store_true")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="run seed; each worker gets its own stream derived from it")
+    args = parser.parse_args()
+
+    self_play(args.episodes, symmetry=args.symmetry, workers=args.workers,
+              sync_every=args.sync_every, seed=args.seed)
@@ -0,0 +1,85 @@
+import argparse
+import csv
+import itertools
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from tictactoe.agent import Qlearner, SARSAlearner, QLambdaLearner, SARSALambdaLearner, LambdaLearner
+from tictactoe.engine import teach, evaluate
+from tictactoe.seeding import seed_all, spawn_seeds
+from tictactoe.teacher import Teacher
+
+AGENTS = {'q': Qlearner, 's': SARSAlearner, 'ql': QLambdaLearner, 'sl': SARSALambdaLearner}
+
+
+def run_config(config):
+    """ Train one agent configuration and evaluate it against each teacher level. """
+    seed_all(config['seed'])
+    cls = AGENTS[config['agent_type']]
+    if issubclass(cls, LambdaLearner):
+        agent = cls(config['alpha'], config['gamma'], config['eps'], config['eps_decay'],
+                    lam=config['lam'])
+    else:
+        agent = cls(config['alpha'], config['gamma'], config['eps'], config['eps_decay'])
+    teach(agent, Teacher(config['teacher_level']), config['episodes'])
+
+    row = dict(config)
+    for level in config['levels']:
+        wins, draws, losses = evaluate(agent, Teacher(level), config['eval_games'])
+        row['win@%g' % level] = wins / config['eval_games']
+        row['draw@%g' % level] = draws / config['eval_games']
+        row['loss@%g' % level] = losses / config['eval_games']
+    del row['levels']
+    return row
+
+
+if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Train and evaluate a grid of "
+                                                 "tic-tac-toe agent configurations.")
+    parser.add_argument('-a', "--agent_types", type=str, nargs='+', default=['q', 's'],
+                        choices=list(AGENTS))
+    parser.add_argument("--alpha", type=float, nargs='+', default=[0.1, 0.5])
+    parser.add_argument("--gamma", type=float, nargs='+', default=[0.9])
+    parser.add_argument("--eps", type=float, nargs='+', default=[0.05, 0.1, 0.2])
+    parser.add_argument("--eps_decay", type=float, nargs='+', default=[0.])
+    parser.add_argument("--lam", type=float, nargs='+', default=[0.8],
+                        help="trace decay rates of the 'ql' and 'sl' agents")
+    parser.add_argument("-t", "--episodes", type=int, default=20000,
+                        help="teacher games used to train each configuration")
+    parser.add_argument("--teacher_level", type=float, default=0.9,
+                        help="ability level of the teacher used for training")
+    parser.add_argument("--levels", type=float, nargs='+', default=[0.5, 0.9, 1.0],
+                        help="teacher ability levels to evaluate against")
+    parser.add_argument("--eval_games", type=int, default=1000)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--out", type=str, default="sweep_results.csv")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="run seed; each configuration gets its own seed derived from it")
+    args = parser.parse_args()
+
+    # lambda only varies for the agents with eligibility traces
+    grid = [(agent_type, alpha, gamma, eps, eps_decay, lam)
+            for agent_type, alpha, gamma, eps, eps_decay in itertools.product(
+                args.agent_types, args.alpha, args.gamma, args.eps, args.eps_decay)
+            for lam in (args.lam if issubclass(AGENTS[agent_type], LambdaLearner) else [0.])]
+    configs = [{'agent_type': agent_type, 'alpha': alpha, 'gamma': gamma, 'eps': eps,
+                'eps_decay': eps_decay, 'lam': lam, 'episodes': args.episodes,
+                'teacher_level': args.teacher_level, 'levels': args.levels,
+                'eval_games': args.eval_games, 'seed': seed}
+               for (agent_type, alpha, gamma, eps, eps_decay, lam), seed
+               in zip(grid, spawn_seeds(np.random.SeedSequence(args.seed), len(grid)))]
+    print("Running %i configurations on %i workers" % (len(configs), args.workers))
+
+    with Pool(args.workers) as pool, open(args.out, 'w', newline='') as f:
+        writer = None
+        for row in pool.imap_unordered(run_config, configs):
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+            print(', '.join('%s=%s' % (k, v) for k, v in row.items()))
+    print("Results written to %s" % args.out)
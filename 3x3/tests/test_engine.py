@@ -0,0 +1,39 @@
+import numpy as np
+
+from tictactoe.agent import Qlearner
+from tictactoe.engine import evaluate, evaluate_perfect
+from tictactoe.seeding import seed_all
+from tictactoe.state import BOARDS, N_STATES, PIECES, SWAPPED
+from tictactoe.teacher import Teacher
+
+
+class RecordingAgent(Qlearner):
+    """ Q-learner that remembers every state it was asked to move in. """
+    def __init__(self):
+        super().__init__(0.5, 0.9, 0.1)
+        self.seen = []
+
+    def get_action(self, s):
+        self.seen.append(s)
+        return super().get_action(s)
+
+    def get_actions(self, states):
+        self.seen.extend(states.tolist())
+        return super().get_actions(states)
+
+
+def test_swapped_exchanges_stones():
+    assert np.array_equal(SWAPPED[SWAPPED], np.arange(N_STATES))
+    assert np.array_equal(BOARDS[SWAPPED] == PIECES['O'], BOARDS == PIECES['X'])
+
+
+def test_x_agent_moving_second_sees_its_training_states():
+    # self-play trains agent2 as 'X', always replying to an 'O' move
+    seed_all(0)
+    for run in (lambda agent: evaluate(agent, Teacher(0.5), 200, 'X', False),
+                lambda agent: evaluate_perfect(agent, 200, 0.5, 'X', False)):
+        agent = RecordingAgent()
+        run(agent)
+        boards = BOARDS[agent.seen]
+        n_o, n_x = (boards == PIECES['O']).sum(axis=1), (boards == PIECES['X']).sum(axis=1)
+        assert len(agent.seen) and (n_o == n_x + 1).all()
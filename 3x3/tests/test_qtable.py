@@ -0,0 +1,28 @@
+import numpy as np
+
+from tictactoe.qtable import QTable
+from tictactoe.state import BOARDS, INVERSE_SYMMETRIES, LEGAL, POW3, SYMMETRIES
+
+
+def transform(s, g):
+    """ Index of board s transformed by symmetry g. """
+    return int(BOARDS[s, SYMMETRIES[g]].dot(POW3))
+
+
+def test_symmetric_moves_share_entries():
+    rng = np.random.RandomState(0)
+    table = QTable(symmetry=True)
+    states = np.flatnonzero(LEGAL.any(axis=1))
+    for _ in range(3000):
+        s = int(rng.choice(states))
+        a = int(rng.choice(np.flatnonzero(LEGAL[s])))
+        table[s, a] = rng.rand()
+        for g in range(len(SYMMETRIES)):
+            assert table[transform(s, g), INVERSE_SYMMETRIES[g, a]] == table[s, a]
+
+
+def test_corners_of_empty_board_are_one_move():
+    table = QTable(symmetry=True)
+    table[0, 0] = 1.
+    assert list(table.row(0)) == [1., 0., 1., 0., 0., 0., 1., 0., 1.]
+    assert np.array_equal(table.row(np.array([0, 0])), np.stack([table.row(0)] * 2))
@@ -0,0 +1,33 @@
+from tictactoe.rewards import RewardTracker
+
+
+def play(tracker, results):
+    for r in results:
+        tracker.add(r, terminal=True)
+
+
+def test_round_trip_keeps_window_order():
+    tracker = RewardTracker(window=10)
+    play(tracker, [1] * 10 + [-1] * 5)
+    loaded = RewardTracker.from_dict(tracker.to_dict())
+    assert loaded.to_dict()['recent'] == tracker.to_dict()['recent']
+
+    play(tracker, [0] * 5)
+    play(loaded, [0] * 5)
+    assert tracker.rates() == (0.0, 0.5, 0.5)
+    assert loaded.rates() == tracker.rates()
+    assert loaded.to_dict()['recent'] == [-1] * 5 + [0] * 5
+
+
+def test_merge_windows_past_capacity():
+    tracker = RewardTracker(window=10)
+    shard = RewardTracker(window=10)
+    play(shard, [1] * 10 + [-1] * 5)
+    tracker.merge([shard])
+    assert tracker.episodes == 15
+    assert tracker.results == [5, 0, 10]
+    assert tracker.rates() == (0.5, 0.0, 0.5)
+
+    play(tracker, [0] * 5)
+    assert tracker.rates() == (0.0, 0.5, 0.5)
+    assert tracker.to_dict()['recent'] == [-1] * 5 + [0] * 5
@@ -1,10 +1,17 @@
 from abc import ABC, abstractmethod
+import json
 import os
 import pickle
-import collections
 import numpy as np
 import random
 
+from tictactoe.qtable import QTable
+from tictactoe.rewards import RewardTracker
+from tictactoe.state import LEGAL, LEGAL_MOVES, state_index
+
+# version of the file format written by Learner.save
+FORMAT_VERSION = 2
+
 
 class Learner(ABC):
     """
@@ -20,8 +27,11 @@ class Learner(ABC):
         probability of random action vs. greedy action
     eps_decay : float
         epsilon decay rate. Larger value = more decay
+    symmetry : boolean
+        whether to share Q values between boards that are rotations or
+        reflections of each other
     """
-    def __init__(self, alpha, gamma, eps, eps_decay=0.):
+    def __init__(self, alpha, gamma, eps, eps_decay=0., symmetry=False):
         # Agent parameters
         self.alpha = alpha
         self.gamma = gamma
@@ -33,12 +43,15 @@ class Learner(ABC):
             for j in range(3):
                 self.actions.append((i,j))
         # Initialize Q values to 0 for all state-action pairs.
-        # Access value for action a, state s via Q[a][s]
-        self.Q = {}
-        for action in self.actions:
-            self.Q[action] = collections.defaultdict(int)
-        # Keep a list of reward received at each episode
-        self.rewards = []
+        # Access value for action index a, state index s via Q[s, a]
+        self.Q = QTable(symmetry)
+        # Keep running statistics of the rewards received
+        self.stats = RewardTracker()
+
+    def config(self):
+        """ Constructor arguments that recreate this agent's settings. """
+        return {'alpha': self.alpha, 'gamma': self.gamma, 'eps': self.eps,
+                'eps_decay': self.eps_decay, 'symmetry': self.Q.symmetry}
 
     def get_action(self, s):
         """
@@ -46,39 +59,90 @@ class Learner(ABC):
 
         Parameters
         ----------
-        s : string
-            state
+        s : int or string
+            state index or state key
         """
-        # Only consider the allowed actions (empty board spaces)
-        possible_actions = [a for a in self.actions if s[a[0]*3 + a[1]] == '-']
+        s = state_index(s)
         if random.random() < self.eps:
-            # Random choose.
-            action = possible_actions[random.randint(0,len(possible_actions)-1)]
+            # Random choose among the allowed actions (empty board spaces)
+            possible_actions = LEGAL_MOVES[s]
+            action = self.actions[possible_actions[random.randint(0,len(possible_actions)-1)]]
         else:
-            # Greedy choose.
-            values = np.array([self.Q[a][s] for a in possible_actions])
-            # Find location of max
-            ix_max = np.where(values == np.max(values))[0]
-            if len(ix_max) > 1:
-                # If multiple actions were max, then sample from them
-                ix_select = np.random.choice(ix_max, 1)[0]
-            else:
-                # If unique max action, select that one
-                ix_select = ix_max[0]
-            action = possible_actions[ix_select]
+            # Greedy choose; ties are sampled at random
+            action = self.actions[self.Q.greedy(s)]
 
         # update epsilon; geometric decay
         self.eps *= (1.-self.eps_decay)
 
         return action
 
+    def get_actions(self, states):
+        """
+        Select actions for many game states at once, with the same
+        epsilon-greedy rule as get_action. Returns an array holding the
+        action index (row*3 + col) chosen for each state.
+
+        Parameters
+        ----------
+        states : array of int
+            state indices
+        """
+        states = np.asarray(states)
+        legal = LEGAL[states]
+        values = np.where(legal, self.Q.row(states), -np.inf)
+        best = values == values.max(axis=1, keepdims=True)
+        # explore among all allowed actions, exploit among the best ones
+        explore = np.random.random(len(states)) < self.eps
+        candidates = np.where(explore[:, None], legal, best)
+        # uniform choice among the candidates: largest random key wins
+        actions = (np.random.random(candidates.shape) * candidates).argmax(axis=1)
+
+        # update epsilon; geometric decay, once per state
+        self.eps *= (1.-self.eps_decay)**len(states)
+
+        return actions
+
+    def __setstate__(self, state):
+        # agents pickled before the array Q-table used Q[(i,j)][state key]
+        if isinstance(state['Q'], dict):
+            state['Q'] = QTable.from_dict(state['Q'])
+        if 'rewards' in state:
+            state['stats'] = RewardTracker.from_rewards(state.pop('rewards'))
+        self.__dict__.update(state)
+
+    def merge(self, agents):
+        """
+        Merge copies of this agent that were trained independently, e.g. in
+        parallel worker processes: their Q-tables are averaged into this
+        one and their reward statistics are added.
+
+        Parameters
+        ----------
+        agents : list of Learner
+            the trained copies
+        """
+        self.Q.merge([agent.Q for agent in agents])
+        self.stats.merge([agent.stats for agent in agents])
+        self.eps = min(agent.eps for agent in agents)
+
     def save(self, path):
-        """ Pickle the agent object instance to save the agent's state. """
-        if os.path.isfile(path):
-            os.remove(path)
-        f = open(path, 'wb')
-        pickle.dump(self, f)
-        f.close()
+        """
+        Save the agent's state as a compressed NumPy archive: the format
+        version, the agent type and settings, the visited Q-table rows and
+        the reward statistics. The per-game history, if kept, lives in its
+        own file (see RewardTracker).
+        """
+        table = self.Q.__getstate__()
+        # write next to the target and swap it in, so the old file stays
+        # intact (and readable) until the new one is complete
+        tmp = '%s.%i.tmp' % (path, os.getpid())
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, version=FORMAT_VERSION,
+                                agent_type=type(self).__name__,
+                                config=json.dumps(self.config()),
+                                rows=table['rows'], values=table['values'],
+                                stats=json.dumps(self.stats.to_dict()))
+        os.replace(tmp, path)
 
     @abstractmethod
     def update(self, s, s_, a, a_, r):
@@ -89,8 +153,8 @@ class Qlearner(Learner):
     """
     A class to implement the Q-learning agent.
     """
-    def __init__(self, alpha, gamma, eps, eps_decay=0.):
-        super().__init__(alpha, gamma, eps, eps_decay)
+    def __init__(self, alpha, gamma, eps, eps_decay=0., symmetry=False):
+        super().__init__(alpha, gamma, eps, eps_decay, symmetry)
 
     def update(self, s, s_, a, a_, r):
         """
@@ -98,9 +162,9 @@ class Qlearner(Learner):
 
         Parameters
         ----------
-        s : string
+        s : int or string
             previous state
-        s_ : string
+        s_ : int or string
             new state
         a : (i,j) tuple
             previous action
@@ -109,27 +173,25 @@ class Qlearner(Learner):
         r : int
             reward received after executing action "a" in state "s"
         """
+        s, a = state_index(s), a[0]*3 + a[1]
         # Update Q(s,a)
         if s_ is not None:
-            # hold list of Q values for all a_,s_ pairs. We will access the max later
-            possible_actions = [action for action in self.actions if s_[action[0]*3 + action[1]] == '-']
-            Q_options = [self.Q[action][s_] for action in possible_actions]
-            # update
-            self.Q[a][s] += self.alpha*(r + self.gamma*max(Q_options) - self.Q[a][s])
+            # max Q value over the allowed actions of the new state
+            self.Q[s, a] += self.alpha*(r + self.gamma*self.Q.max_legal(state_index(s_)) - self.Q[s, a])
         else:
             # terminal state update
-            self.Q[a][s] += self.alpha*(r - self.Q[a][s])
+            self.Q[s, a] += self.alpha*(r - self.Q[s, a])
 
-        # add r to rewards list
-        self.rewards.append(r)
+        # record r in the reward statistics
+        self.stats.add(r, s_ is None)
 
 
 class SARSAlearner(Learner):
     """
     A class to implement the SARSA agent.
     """
-    def __init__(self, alpha, gamma, eps, eps_decay=0.):
-        super().__init__(alpha, gamma, eps, eps_decay)
+    def __init__(self, alpha, gamma, eps, eps_decay=0., symmetry=False):
+        super().__init__(alpha, gamma, eps, eps_decay, symmetry)
 
     def update(self, s, s_, a, a_, r):
         """
@@ -137,9 +199,9 @@ class SARSAlearner(Learner):
 
         Parameters
         ----------
-        s : string
+        s : int or string
             previous state
-        s_ : string
+        s_ : int or string
             new state
         a : (i,j) tuple
             previous action
@@ -148,12 +210,195 @@ class SARSAlearner(Learner):
         r : int
             reward received after executing action "a" in state "s"
         """
+        s, a = state_index(s), a[0]*3 + a[1]
         # Update Q(s,a)
         if s_ is not None:
-            self.Q[a][s] += self.alpha*(r + self.gamma*self.Q[a_][s_] - self.Q[a][s])
+            self.Q[s, a] += self.alpha*(r + self.gamma*self.Q[state_index(s_), a_[0]*3 + a_[1]] - self.Q[s, a])
+        else:
+            # terminal state update
+            self.Q[s, a] += self.alpha*(r - self.Q[s, a])
+
+        # record r in the reward statistics
+        self.stats.add(r, s_ is None)
+
+
+class LambdaLearner(Learner):
+    """
+    Parent class for agents with eligibility traces. Every visited
+    state-action pair keeps a trace that decays by gamma*lam per step, and
+    each TD error updates all pairs in proportion to their trace, so a
+    reward reaches the opening moves of a game in a single episode. Traces
+    are kept sparse in a dict keyed by Q-table cell, with replacing traces;
+    they are dropped once below 'min_trace' and cleared at the end of every
+    episode.
+
+    Parameters
+    ----------
+    alpha : float
+        learning rate
+    gamma : float
+        temporal discounting rate
+    eps : float
+        probability of random action vs. greedy action
+    eps_decay : float
+        epsilon decay rate. Larger value = more decay
+    symmetry : boolean
+        whether to share Q values between boards that are rotations or
+        reflections of each other
+    lam : float
+        trace decay rate. lam = 0 gives the one-step update
+    """
+    min_trace = 1e-3
+
+    def __init__(self, alpha, gamma, eps, eps_decay=0., symmetry=False, lam=0.8):
+        super().__init__(alpha, gamma, eps, eps_decay, symmetry)
+        self.lam = lam
+        self.traces = {}
+
+    def config(self):
+        config = super().config()
+        config['lam'] = self.lam
+        return config
+
+    def _trace_update(self, s, a, delta, terminal, cut=False):
+        """
+        Update every traced Q value with the TD error of (s, a) and decay
+        the traces.
+
+        Parameters
+        ----------
+        s : int
+            state index
+        a : int
+            action index
+        delta : float
+            TD error
+        terminal : boolean
+            whether the episode ended; clears the traces
+        cut : boolean
+            clear the traces after this update (off-policy step)
+        """
+        traces = self.traces
+        traces[self.Q._index((s, a))] = 1.
+        values = self.Q.values
+        step = self.alpha*delta
+        decay = self.gamma*self.lam
+        for cell, e in list(traces.items()):
+            values[cell] += step*e
+            e *= decay
+            if e < self.min_trace:
+                del traces[cell]
+            else:
+                traces[cell] = e
+        if terminal or cut:
+            traces.clear()
+
+
+class QLambdaLearner(LambdaLearner):
+    """
+    A class to implement the Watkins Q(lambda) agent.
+    """
+    def update(self, s, s_, a, a_, r):
+        """
+        Perform the Q(lambda) update of Q values. Traces are cut after an
+        exploratory (non-greedy) action.
+
+        Parameters
+        ----------
+        s : int or string
+            previous state
+        s_ : int or string
+            new state
+        a : (i,j) tuple
+            previous action
+        a_ : (i,j) tuple
+            new action, used to detect exploratory actions
+        r : int
+            reward received after executing action "a" in state "s"
+        """
+        s, a = state_index(s), a[0]*3 + a[1]
+        if s_ is not None:
+            s_ = state_index(s_)
+            best = self.Q.max_legal(s_)
+            delta = r + self.gamma*best - self.Q[s, a]
+            cut = a_ is not None and self.Q[s_, a_[0]*3 + a_[1]] < best
+            self._trace_update(s, a, delta, False, cut)
+        else:
+            # terminal state update
+            self._trace_update(s, a, r - self.Q[s, a], True)
+
+        # record r in the reward statistics
+        self.stats.add(r, s_ is None)
+
+
+class SARSALambdaLearner(LambdaLearner):
+    """
+    A class to implement the SARSA(lambda) agent.
+    """
+    def update(self, s, s_, a, a_, r):
+        """
+        Perform the SARSA(lambda) update of Q values.
+
+        Parameters
+        ----------
+        s : int or string
+            previous state
+        s_ : int or string
+            new state
+        a : (i,j) tuple
+            previous action
+        a_ : (i,j) tuple
+            new action
+        r : int
+            reward received after executing action "a" in state "s"
+        """
+        s, a = state_index(s), a[0]*3 + a[1]
+        if s_ is not None:
+            delta = r + self.gamma*self.Q[state_index(s_), a_[0]*3 + a_[1]] - self.Q[s, a]
+            self._trace_update(s, a, delta, False)
         else:
             # terminal state update
-            self.Q[a][s] += self.alpha*(r - self.Q[a][s])
+            self._trace_update(s, a, r - self.Q[s, a], True)
+
+        # record r in the reward statistics
+        self.stats.add(r, s_ is None)
+
+
+def load_agent(path):
+    """
+    Load an agent saved with Learner.save. Agents saved by older versions
+    are loaded too.
+
+    Parameters
+    ----------
+    path : string
+        path of the agent file
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic != b'PK\x03\x04':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    # read every field before the archive is closed
+    with np.load(path) as data:
+        version = int(data['version'])
+        if version > FORMAT_VERSION:
+            raise ValueError("Cannot load agent: file format version %i is newer "
+                             "than this code supports." % version)
+        agent_type = str(data['agent_type'])
+        config = json.loads(str(data['config']))
+        table = {'rows': data['rows'], 'values': data['values']}
+        if 'stats' in data:
+            stats = RewardTracker.from_dict(json.loads(str(data['stats'])))
+        else:
+            # version 1 kept the raw reward list
+            stats = RewardTracker.from_rewards(data['rewards'])
 
-        # add r to rewards list
-        self.rewards.append(r)
\ No newline at end of file
+    agent_types = {cls.__name__: cls for cls in (Qlearner, SARSAlearner,
+                                                   QLambdaLearner, SARSALambdaLearner)}
+    agent = agent_types[agent_type](**config)
+    table['symmetry'] = agent.Q.symmetry
+    agent.Q.__setstate__(table)
+    agent.stats = stats
+    return agent
@@ -0,0 +1,73 @@
+"""
+Board evaluation on bit masks. Each player's stones are kept as a 9-bit
+mask (bit i*3 + j for cell (i, j)), so wins, draws and open two-in-a-rows
+are answered with a few integer operations and table lookups.
+"""
+
+# cell masks of the 8 winning lines, in the order Teacher looks for them:
+# both diagonals, then column and row i for i = 0, 1, 2
+LINES = ((0, 4, 8), (2, 4, 6),
+         (0, 3, 6), (0, 1, 2),
+         (1, 4, 7), (3, 4, 5),
+         (2, 5, 8), (6, 7, 8))
+WIN_MASKS = tuple(sum(1 << cell for cell in line) for line in LINES)
+FULL = (1 << 9) - 1
+
+# whether a stone mask contains a winning line
+WINNING = [any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9)]
+# for each stone mask, the (line mask, empty cell) pairs of the lines holding
+# exactly two of its stones
+TWO_IN_LINE = [tuple((mask, mask & ~bits) for mask in WIN_MASKS
+                     if bin(bits & mask).count('1') == 2)
+               for bits in range(1 << 9)]
+# cell index of each single-bit mask
+CELL = {1 << cell: cell for cell in range(9)}
+
+
+def board_bits(board):
+    """
+    Returns the stone masks (O, X) of a 2D list board.
+
+    Parameters
+    ----------
+    board : list of lists
+        the game board
+    """
+    o = x = 0
+    bit = 1
+    for row in board:
+        for elt in row:
+            if elt == 'O':
+                o |= bit
+            elif elt == 'X':
+                x |= bit
+            bit <<= 1
+    return o, x
+
+
+def is_win(bits):
+    """ Whether the stone mask 'bits' holds three in a row. """
+    return WINNING[bits]
+
+
+def is_full(o, x):
+    """ Whether no empty cell is left. """
+    return o | x == FULL
+
+
+def winning_cell(own, other):
+    """
+    Returns the index of an empty cell that completes a line in which
+    'own' already has two stones, or None.
+
+    Parameters
+    ----------
+    own : int
+        stone mask of the player to move
+    other : int
+        stone mask of the opponent
+    """
+    for mask, empty in TWO_IN_LINE[own]:
+        if not other & mask:
+            return CELL[empty]
+    return None
@@ -0,0 +1,290 @@
+"""
+Headless training engine. Plays learner vs. teacher games on integer boards
+without creating Game objects or printing anything: each side's stones are a
+9-bit mask, wins are looked up in the tables of tictactoe.board, and the
+state key is updated incrementally for the agent.
+"""
+import random
+import time
+import numpy as np
+
+from tictactoe import solver
+from tictactoe.board import FULL, WINNING
+from tictactoe.state import LEGAL, POW3, PIECES, SWAPPED
+from tictactoe.game import Game
+
+_O, _X = PIECES['O'], PIECES['X']
+
+
+def play_game(agent, teacher, board, learn=True, token='O', agent_first=None):
+    """
+    Play one game of 'agent' (token 'O') against 'teacher' (token 'X') with
+    the same rules and update sequence as Game.playGame, and return the
+    agent's final reward (1 win, 0 draw, -1 loss). Who moves first is chosen
+    at random unless 'agent_first' is given.
+
+    Parameters
+    ----------
+    agent : Learner
+        agent to play
+    teacher : Teacher
+        opponent
+    board : list of lists
+        scratch board, reset here and reused between games
+    learn : boolean
+        whether the agent updates its Q values
+    token : string
+        token the agent was trained with. An 'X' agent is shown every board
+        with the stones swapped, so it plays from the states it learned.
+    agent_first : boolean or None
+        whether the agent moves first (None = random)
+    """
+    for row in board:
+        row[0] = row[1] = row[2] = '-'
+    o_bits = x_bits = key = 0
+    get_action, update = agent.get_action, agent.update
+    # 'key' is the board the teacher sees, 'view' the board the agent sees
+    view = 0
+    own, other = (_O, _X) if token == 'O' else (_X, _O)
+
+    if agent_first is None:
+        agent_first = random.random() < 0.5
+    if not agent_first:
+        i, j = teacher.makeMove(board, key)
+        board[i][j] = 'X'
+        x_bits |= 1 << (i*3 + j)
+        key += POW3[i*3 + j] * _X
+        view += POW3[i*3 + j] * other
+
+    prev_state = view
+    prev_action = get_action(view)
+    while True:
+        i, j = prev_action
+        board[i][j] = 'O'
+        o_bits |= 1 << (i*3 + j)
+        key += POW3[i*3 + j] * _O
+        view += POW3[i*3 + j] * own
+        if WINNING[o_bits]:
+            reward = 1
+            break
+        if o_bits | x_bits == FULL:
+            reward = 0
+            break
+
+        i, j = teacher.makeMove(board, key)
+        board[i][j] = 'X'
+        x_bits |= 1 << (i*3 + j)
+        key += POW3[i*3 + j] * _X
+        view += POW3[i*3 + j] * other
+        if WINNING[x_bits]:
+            reward = -1
+            break
+        if o_bits | x_bits == FULL:
+            reward = 0
+            break
+
+        new_action = get_action(view)
+        if learn:
+            update(prev_state, view, prev_action, new_action, 0)
+        prev_state = view
+        prev_action = new_action
+
+    if learn:
+        update(prev_state, None, prev_action, None, reward)
+    return reward
+
+
+def teach(agent, teacher, episodes, log_every=0):
+    """
+    Train 'agent' against 'teacher' for a number of games.
+
+    Parameters
+    ----------
+    agent : Learner
+        agent to train
+    teacher : Teacher
+        opponent
+    episodes : int
+        number of games to play
+    log_every : int
+        print progress every 'log_every' games (0 = never)
+    """
+    board = [['-', '-', '-'], ['-', '-', '-'], ['-', '-', '-']]
+    for episode in range(1, episodes + 1):
+        play_game(agent, teacher, board)
+        if log_every and episode % log_every == 0:
+            print("Games played: %i" % episode)
+
+
+def evaluate(agent, teacher, games, token='O', agent_first=None):
+    """
+    Play greedy (eps = 0) games without learning and return the number of
+    agent wins, draws and losses.
+
+    Parameters
+    ----------
+    agent : Learner
+        agent to evaluate
+    teacher : Teacher
+        opponent
+    games : int
+        number of games to play
+    token : string
+        token the agent was trained with, 'O' or 'X'
+    agent_first : boolean or None
+        whether the agent moves first (None = random in each game)
+    """
+    board = [['-', '-', '-'], ['-', '-', '-'], ['-', '-', '-']]
+    results = {1: 0, 0: 0, -1: 0}
+    eps, agent.eps = agent.eps, 0.
+    try:
+        for _ in range(games):
+            results[play_game(agent, teacher, board, False, token, agent_first)] += 1
+    finally:
+        agent.eps = eps
+    return results[1], results[0], results[-1]
+
+
+def evaluate_perfect(agent, games, level=1., token='O', agent_first=None):
+    """
+    Play many greedy (eps = 0) games at once against the exact solver
+    player and return the number of agent wins, draws and losses. All games
+    advance together one move at a time: the agent picks its moves with
+    get_actions, and the opponent plays a random optimal move with
+    probability 'level' and a random allowed move otherwise.
+
+    Parameters
+    ----------
+    agent : Learner
+        agent to evaluate (token 'O')
+    games : int
+        number of games to play
+    level : float
+        ability level of the solver player (token 'X')
+    token : string
+        token the agent was trained with. An 'X' agent is shown every board
+        with the stones swapped, so it plays from the states it learned.
+    agent_first : boolean or None
+        whether the agent moves first (None = random in each game)
+    """
+    table = solver.load_table()
+    winning = np.array(WINNING)
+    pow3 = np.array(POW3)
+    keys = np.zeros(games, dtype=np.int64)
+    bits = np.zeros((2, games), dtype=np.int64)
+    result = np.zeros(games, dtype=np.int64)
+    active = np.ones(games, dtype=bool)
+    if agent_first is None:
+        agent_first = np.random.random(games) < 0.5
+    else:
+        agent_first = np.full(games, agent_first)
+
+    eps, agent.eps = agent.eps, 0.
+    try:
+        for ply in range(9):
+            for player, piece, movers in ((0, PIECES['O'], agent_first == (ply % 2 == 0)),
+                                          (1, PIECES['X'], agent_first != (ply % 2 == 0))):
+                idx = np.flatnonzero(active & movers)
+                if len(idx) == 0:
+                    continue
+                states = keys[idx]
+                if player == 0:
+                    actions = agent.get_actions(states if token == 'O' else SWAPPED[states])
+                else:
+                    legal = LEGAL[states]
+                    values = table[1, states]
+                    best = values == values.max(axis=1, keepdims=True)
+                    candidates = np.where((np.random.random(len(idx)) < level)[:, None], best, legal)
+                    actions = (np.random.random(candidates.shape) * candidates).argmax(axis=1)
+
+                keys[idx] += pow3[actions] * piece
+                bits[player, idx] |= 1 << actions
+                won = winning[bits[player, idx]]
+                full = (bits[0, idx] | bits[1, idx]) == FULL
+                result[idx[won]] = 1 if player == 0 else -1
+                active[idx[won | full]] = False
+    finally:
+        agent.eps = eps
+
+    return int((result == 1).sum()), int((result == 0).sum()), int((result == -1).sum())
+
+
+def self_play_game(agents):
+    """
+    Play one game between two learners, agents[0] with token 'O' moving
+    first and agents[1] with token 'X', and update both. Each agent learns
+    from its own previous state and action: the next state it sees is the
+    board after the opponent's reply, and when the game ends the loser is
+    credited with its own last move. Returns the reward of agents[0].
+
+    Parameters
+    ----------
+    agents : list
+        the two Learners
+    """
+    bits = [0, 0]
+    pieces = (_O, _X)
+    prev = [None, None]
+    key = 0
+    player = 0
+    action = agents[0].get_action(key)
+
+    while True:
+        state = key
+        i, j = action
+        bits[player] |= 1 << (i*3 + j)
+        key += POW3[i*3 + j] * pieces[player]
+        other = 1 - player
+
+        if WINNING[bits[player]] or bits[0] | bits[1] == FULL:
+            reward = 1 if WINNING[bits[player]] else 0
+            agents[player].update(state, None, action, None, reward)
+            if prev[other] is not None:
+                agents[other].update(prev[other][0], None, prev[other][1], None, -reward)
+            return reward if player == 0 else -reward
+
+        next_action = agents[other].get_action(key)
+        if prev[other] is not None:
+            agents[other].update(prev[other][0], key, prev[other][1], next_action, 0)
+        prev[player] = (state, action)
+        player = other
+        action = next_action
+
+
+def benchmark(agent_factory, teacher, episodes=5000):
+    """
+    Compare games per second of teach() with the Game-based loop.
+
+    Parameters
+    ----------
+    agent_factory : callable
+        returns a fresh agent, so both loops start from an empty Q-table
+    teacher : Teacher
+        opponent
+    episodes : int
+        number of games per loop
+    """
+    agent = agent_factory()
+    start = time.perf_counter()
+    for _ in range(episodes):
+        Game(agent, teacher=teacher).start()
+    game_rate = episodes / (time.perf_counter() - start)
+
+    agent = agent_factory()
+    start = time.perf_counter()
+    teach(agent, teacher, episodes)
+    engine_rate = episodes / (time.perf_counter() - start)
+
+    return {'game_loop': game_rate, 'engine': engine_rate}
+
+
+if __name__ == "__main__":
+    from tictactoe.agent import Qlearner, SARSAlearner
+    from tictactoe.teacher import Teacher
+
+    for name, cls in [('Q-learning', Qlearner), ('SARSA', SARSAlearner)]:
+        for perfect in (False, True):
+            rates = benchmark(lambda: cls(0.5, 0.9, 0.1), Teacher(perfect=perfect))
+            print("%s, %s teacher: Game loop %.0f games/s, engine %.0f games/s"
+                  % (name, 'perfect' if perfect else 'heuristic',
+                     rates['game_loop'], rates['engine']))
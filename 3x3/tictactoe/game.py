@@ -1,21 +1,35 @@
 import random
 
+from tictactoe.board import WINNING, FULL
+from tictactoe.state import PIECES, POW3, move_key
+
 
 class Game:
     """ The game class. New instance created for each new game. """
     def __init__(self, agent, teacher=None):
         self.agent = agent
         self.teacher = teacher
-        # initialize the game board
+        # initialize the game board, its integer state key and the stone
+        # masks of both players
         self.board = [['-', '-', '-'], ['-', '-', '-'], ['-', '-', '-']]
+        self.key = 0
+        self.bits = {'O': 0, 'X': 0}
+
+    def place(self, action, key):
+        """
+        Put token 'key' at cell 'action' and update the state key.
+        """
+        self.board[action[0]][action[1]] = key
+        self.key = move_key(self.key, action, key)
+        self.bits[key] |= 1 << (action[0]*3 + action[1])
 
     def playerMove(self):
         """
         Querry player for a move and update the board accordingly.
         """
         if self.teacher is not None:
-            action = self.teacher.makeMove(self.board)
-            self.board[action[0]][action[1]] = 'X'
+            action = self.teacher.makeMove(self.board, self.key)
+            self.place(action, 'X')
         else:
             printBoard(self.board)
             while True:
@@ -30,14 +44,14 @@ class Game:
                 if row not in range(3) or col not in range(3) or not self.board[row][col] == '-':
                     print("INVALID MOVE! Choose again.")
                     continue
-                self.board[row][col] = 'X'
+                self.place((row, col), 'X')
                 break
 
     def agentMove(self, action):
         """
         Update board according to agent's move.
         """
-        self.board[action[0]][action[1]] = 'O'
+        self.place(action, 'O')
 
     def checkForWin(self, key):
         """
@@ -49,30 +63,14 @@ class Game:
         key : string
             token of most recent player. Either 'O' or 'X'
         """
-        # check for player win on diagonals
-        a = [self.board[0][0], self.board[1][1], self.board[2][2]]
-        b = [self.board[0][2], self.board[1][1], self.board[2][0]]
-        if a.count(key) == 3 or b.count(key) == 3:
-            return True
-        # check for player win on rows/columns
-        for i in range(3):
-            col = [self.board[0][i], self.board[1][i], self.board[2][i]]
-            row = [self.board[i][0], self.board[i][1], self.board[i][2]]
-            if col.count(key) == 3 or row.count(key) == 3:
-                return True
-        return False
+        return WINNING[self.bits[key]]
 
     def checkForDraw(self):
         """
         Check to see whether the game has ended in a draw. Returns a
         boolean holding truth value.
         """
-        draw = True
-        for row in self.board:
-            for elt in row:
-                if elt == '-':
-                    draw = False
-        return draw
+        return self.bits['O'] | self.bits['X'] == FULL
 
     def checkForEnd(self, key):
         """
@@ -114,7 +112,7 @@ class Game:
         # Initialize the agent's state and action
         if player_first:
             self.playerMove()
-        prev_state = getStateKey(self.board)
+        prev_state = self.key
         prev_action = self.agent.get_action(prev_state)
 
         # iterate until game is over
@@ -135,7 +133,7 @@ class Game:
             else:
                 # game continues. 0 reward
                 reward = 0
-            new_state = getStateKey(self.board)
+            new_state = self.key
 
             # determine new action (epsilon-greedy)
             new_action = self.agent.get_action(new_state)
@@ -193,16 +191,13 @@ def printBoard(board):
 
 def getStateKey(board):
     """
-    Converts 2D list representing the board state into a string key
-    for that state. Keys are used for Q-value hashing.
+    Converts 2D list representing the board state into the integer key
+    for that state. Keys index the agents' Q-tables.
 
     Parameters
     ----------
     board : list of lists
         the current game board
     """
-    key = ''
-    for row in board:
-        for elt in row:
-            key += elt
-    return key
\ No newline at end of file
+    return sum(PIECES[elt] * POW3[i*3 + j]
+               for i, row in enumerate(board) for j, elt in enumerate(row))
\ No newline at end of file
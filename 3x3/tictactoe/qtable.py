@@ -0,0 +1,124 @@
+import numpy as np
+
+from tictactoe.state import (N_CELLS, N_STATES, LEGAL, CANONICAL, CANONICAL_SYMMETRY,
+                             INVERSE_SYMMETRIES, ACTION_ORBIT, encode)
+
+
+class QTable:
+    """
+    Dense Q-value table with one row of action values per encoded board.
+    Access value for action index a, state index s via Q[s, a]. Only the
+    visited rows are kept when the table is pickled.
+
+    Parameters
+    ----------
+    symmetry : boolean
+        whether boards that are rotations or reflections of each other share
+        one row. States and actions are mapped to the canonical board on
+        access, so callers always use the coordinates of the actual board;
+        moves that a symmetry of the board maps onto each other share one
+        entry.
+    """
+    def __init__(self, symmetry=False):
+        self.symmetry = symmetry
+        self.values = np.zeros((N_STATES, N_CELLS), dtype=np.float32)
+
+    def _index(self, key):
+        s, a = key
+        if self.symmetry:
+            c = CANONICAL[s]
+            return c, ACTION_ORBIT[c, INVERSE_SYMMETRIES[CANONICAL_SYMMETRY[s], a]]
+        return s, a
+
+    def __getitem__(self, key):
+        return self.values[self._index(key)]
+
+    def __setitem__(self, key, value):
+        self.values[self._index(key)] = value
+
+    def row(self, s):
+        """
+        Return the Q values of all actions in state s, or one row per state
+        if s is an array of states.
+
+        Parameters
+        ----------
+        s : int or array of int
+            state index
+        """
+        if self.symmetry:
+            c = np.expand_dims(CANONICAL[s], -1)
+            return self.values[c, ACTION_ORBIT[c, INVERSE_SYMMETRIES[CANONICAL_SYMMETRY[s]]]]
+        return self.values[s]
+
+    def max_legal(self, s):
+        """
+        Return the largest Q value over the allowed actions of state s.
+
+        Parameters
+        ----------
+        s : int
+            state index
+        """
+        return self.row(s)[LEGAL[s]].max()
+
+    def greedy(self, s):
+        """
+        Return the index of the allowed action with the largest Q value in
+        state s. Ties are broken uniformly at random.
+
+        Parameters
+        ----------
+        s : int
+            state index
+        """
+        values = self.row(s)
+        legal = LEGAL[s]
+        ix_max = np.flatnonzero(legal & (values == values[legal].max()))
+        if len(ix_max) > 1:
+            return np.random.choice(ix_max)
+        return ix_max[0]
+
+    def merge(self, tables):
+        """
+        Merge tables that were trained independently starting from a copy of
+        this one. Each entry becomes the average over the tables that changed
+        it, or keeps its value if none did.
+
+        Parameters
+        ----------
+        tables : list of QTable
+            the independently trained copies
+        """
+        total = np.zeros_like(self.values)
+        count = np.zeros(self.values.shape, dtype=np.int32)
+        for table in tables:
+            changed = table.values != self.values
+            total += np.where(changed, table.values, 0.)
+            count += changed
+        np.divide(total, count, out=self.values, where=count > 0)
+
+    def __getstate__(self):
+        rows = np.flatnonzero(self.values.any(axis=1))
+        return {'symmetry': self.symmetry, 'rows': rows.astype(np.uint16), 'values': self.values[rows]}
+
+    def __setstate__(self, state):
+        self.symmetry = state.get('symmetry', False)
+        self.values = np.zeros((N_STATES, N_CELLS), dtype=np.float32)
+        self.values[state['rows']] = state['values']
+
+    @classmethod
+    def from_dict(cls, Q):
+        """
+        Build a table from the legacy layout Q[(i,j)][state key string].
+
+        Parameters
+        ----------
+        Q : dict
+            maps (i,j) action tuples to dicts of state key -> Q value
+        """
+        table = cls()
+        for (i, j), values in Q.items():
+            for s, value in values.items():
+                table[encode(s), i*3 + j] = value
+        return table
@@ -0,0 +1,192 @@
+import os
+import numpy as np
+
+
+class RewardTracker:
+    """
+    Running statistics of the rewards a learner receives, in constant memory.
+    Games end with a final reward of 1 (win), 0 (draw) or -1 (loss).
+
+    Parameters
+    ----------
+    window : int
+        number of most recent games the win/draw/loss rates are taken over
+    ema_decay : float
+        weight of the newest game in the exponential moving average of the
+        final reward
+    history_path : string
+        optional file that the final reward of every game is appended to,
+        as raw int8 values that can be memory-mapped
+    """
+    def __init__(self, window=1000, ema_decay=0.01, history_path=None):
+        self.window = window
+        self.ema_decay = ema_decay
+        self.history_path = history_path
+        # all updates: count and cumulative reward
+        self.updates = 0
+        self.total = 0
+        # finished games: count, results indexed by reward+1, average
+        self.episodes = 0
+        self.results = [0, 0, 0]
+        self.ema = 0.
+        # ring buffer of the last 'window' results, its next write slot and
+        # the counts of the results it holds
+        self._recent = np.zeros(window, dtype=np.int8)
+        self._pos = 0
+        self._recent_results = [0, 0, 0]
+        self._pending = bytearray()
+
+    def add(self, r, terminal=False):
+        """
+        Record the reward of one update.
+
+        Parameters
+        ----------
+        r : int
+            reward received
+        terminal : boolean
+            whether the update ended the game
+        """
+        self.updates += 1
+        self.total += r
+        if terminal:
+            self._end_episode(r)
+
+    def _push_recent(self, r):
+        # the oldest result drops out once the ring is full
+        k = self._pos
+        if sum(self._recent_results) == self.window:
+            self._recent_results[self._recent[k] + 1] -= 1
+        self._recent[k] = r
+        self._recent_results[r + 1] += 1
+        self._pos = (k + 1) % self.window
+
+    def _recent_order(self):
+        # ring slots of the recent results, oldest first
+        n = sum(self._recent_results)
+        return [(self._pos - n + k) % self.window for k in range(n)]
+
+    def _end_episode(self, r):
+        self._push_recent(r)
+        self.results[r + 1] += 1
+        self.episodes += 1
+        self.ema += self.ema_decay * (r - self.ema)
+        if self.history_path is not None:
+            self._pending.append(r & 0xFF)
+            if len(self._pending) >= 4096:
+                self.flush()
+
+    def rates(self):
+        """ Win, draw and loss rates over the last 'window' games. """
+        n = max(min(self.episodes, self.window), 1)
+        losses, draws, wins = self._recent_results
+        return wins / n, draws / n, losses / n
+
+    def summary(self):
+        """ Dictionary of the current statistics, e.g. for printing. """
+        win, draw, loss = self.rates()
+        return {'updates': self.updates, 'cumulative_reward': self.total,
+                'episodes': self.episodes, 'wins': self.results[2],
+                'draws': self.results[1], 'losses': self.results[0],
+                'recent_win_rate': win, 'recent_draw_rate': draw,
+                'recent_loss_rate': loss, 'reward_ema': self.ema}
+
+    def flush(self):
+        """ Append pending results to the history file. """
+        if self._pending:
+            with open(self.history_path, 'ab') as f:
+                f.write(self._pending)
+            self._pending = bytearray()
+
+    def history(self):
+        """
+        Return the per-game results recorded in the history file as a
+        read-only memory-mapped int8 array (empty if there are none).
+        """
+        if self.history_path is None:
+            return np.zeros(0, dtype=np.int8)
+        self.flush()
+        return load_history(self.history_path)
+
+    def merge(self, trackers):
+        """
+        Add the statistics of trackers that recorded other games, e.g. in
+        parallel worker processes. Their results are not appended to this
+        tracker's history file.
+
+        Parameters
+        ----------
+        trackers : list of RewardTracker
+            the other trackers
+        """
+        history_path, self.history_path = self.history_path, None
+        for tracker in trackers:
+            for r in tracker._recent[tracker._recent_order()]:
+                self._push_recent(int(r))
+                self.ema += self.ema_decay * (int(r) - self.ema)
+            # only the recent results enter the window; all of them count
+            self.episodes += tracker.episodes
+            for k in range(3):
+                self.results[k] += tracker.results[k]
+            self.updates += tracker.updates
+            self.total += tracker.total
+        self.history_path = history_path
+
+    def to_dict(self):
+        """ JSON-serializable state, used when saving the agent. """
+        self.flush()
+        return {'window': self.window, 'ema_decay': self.ema_decay,
+                'history_path': self.history_path, 'updates': self.updates,
+                'total': self.total, 'episodes': self.episodes,
+                'results': self.results, 'ema': self.ema,
+                'recent': self._recent[self._recent_order()].tolist()}
+
+    @classmethod
+    def from_dict(cls, state):
+        tracker = cls(state['window'], state['ema_decay'])
+        for r in state['recent']:
+            tracker._push_recent(r)
+        tracker.history_path = state['history_path']
+        tracker.updates = state['updates']
+        tracker.total = state['total']
+        tracker.episodes = state['episodes']
+        tracker.results = state['results']
+        tracker.ema = state['ema']
+        return tracker
+
+    @classmethod
+    def from_rewards(cls, rewards):
+        """
+        Tracker holding the totals of a legacy per-update reward list. Those
+        lists do not mark which updates ended a game, so no per-game
+        statistics can be recovered.
+        """
+        tracker = cls()
+        tracker.updates = len(rewards)
+        tracker.total = int(np.sum(rewards))
+        return tracker
+
+    def __getstate__(self):
+        if self.history_path is not None:
+            self.flush()
+        return self.__dict__.copy()
+
+    def __setstate__(self, state):
+        # trackers pickled before the ring kept its own write slot
+        if '_pos' not in state:
+            state['_pos'] = state['episodes'] % state['window']
+        self.__dict__.update(state)
+
+
+def load_history(path):
+    """
+    Memory-map a per-game results file written by RewardTracker.
+
+    Parameters
+    ----------
+    path : string
+        path of the history file
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.int8)
+    return np.memmap(path, dtype=np.int8, mode='r')
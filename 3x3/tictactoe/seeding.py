@@ -0,0 +1,40 @@
+"""
+Run-level seeding. One seed drives Python's random module and NumPy's
+global generator, which are the only sources of randomness used by the
+agents, the teacher and the engine. Worker processes get independent
+streams derived from the run seed with a NumPy SeedSequence.
+"""
+import random
+
+import numpy as np
+
+
+def seed_all(seed):
+    """
+    Seed the random and numpy.random global generators. Does nothing if
+    seed is None.
+
+    Parameters
+    ----------
+    seed : int or None
+        run seed
+    """
+    if seed is None:
+        return
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+
+def spawn_seeds(sequence, n):
+    """
+    Return n new 32-bit seeds drawn from a SeedSequence. Each call gives
+    different seeds, so e.g. every round of worker tasks gets fresh streams.
+
+    Parameters
+    ----------
+    sequence : numpy.random.SeedSequence
+        sequence created from the run seed (entropy from the OS if None)
+    n : int
+        number of seeds
+    """
+    return [int(child.generate_state(1)[0]) for child in sequence.spawn(n)]
@@ -0,0 +1,121 @@
+"""
+Exact tic-tac-toe solver. Every position reachable from the empty board,
+with either token moving first, is solved once by memoized negamax. The
+value of each move is stored in a (2, 3**9, 9) int8 table that is cached
+on disk and memory-mapped on later loads.
+"""
+import os
+import random
+import numpy as np
+
+from tictactoe.board import LINES
+from tictactoe.state import BOARDS, LEGAL, N_CELLS, N_STATES, PIECES, POW3
+
+WIN, DRAW, LOSS, ILLEGAL = 1, 0, -1, -2
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfect_play.npy')
+
+_table = None
+_best_moves = {}
+
+
+def solve():
+    """
+    Compute the move values of every reachable position. Entry [p, s, a] is
+    the game result (WIN, DRAW or LOSS) of action index a in state index s
+    for the player with token p (0 = 'O', 1 = 'X') to move, under perfect
+    play by both sides. Moves that are not allowed hold ILLEGAL.
+    """
+    won = [(BOARDS[:, LINES] == piece).all(axis=2).any(axis=1) for piece in (1, 2)]
+    full = ~LEGAL.any(axis=1)
+    values = np.full((2, N_STATES, N_CELLS), ILLEGAL, dtype=np.int8)
+    solved = np.zeros((2, N_STATES), dtype=bool)
+    legal_actions = [np.flatnonzero(legal) for legal in LEGAL]
+
+    def negamax(s, p):
+        if not solved[p, s]:
+            for a in legal_actions[s]:
+                child = s + POW3[a] * (p + 1)
+                if won[p][child]:
+                    values[p, s, a] = WIN
+                elif full[child]:
+                    values[p, s, a] = DRAW
+                else:
+                    values[p, s, a] = -negamax(child, 1 - p)
+            solved[p, s] = True
+        return values[p, s].max()
+
+    negamax(0, 0)
+    negamax(0, 1)
+    return values
+
+
+def load_table(path=TABLE_PATH):
+    """
+    Return the move value table, solving and saving it to 'path' first if
+    it is not cached yet. The table is loaded once per process.
+
+    Parameters
+    ----------
+    path : string
+        location of the cached .npy table
+    """
+    global _table
+    if _table is None:
+        if not os.path.isfile(path):
+            # write under a private name and move it into place, so that
+            # processes solving at the same time never read a partial file
+            tmp = '%s.%i.tmp' % (path, os.getpid())
+            with open(tmp, 'wb') as f:
+                np.save(f, solve())
+            os.replace(tmp, path)
+        _table = np.load(path, mmap_mode='r')
+    return _table
+
+
+def move_values(s, key):
+    """
+    Return the values of all 9 actions in state s for the player with
+    token 'key' to move.
+
+    Parameters
+    ----------
+    s : int
+        state index
+    key : string
+        token of the player to move. Either 'O' or 'X'
+    """
+    return load_table()[PIECES[key] - 1, s]
+
+
+def best_moves(s, key):
+    """
+    Return the list of optimal action indices in state s for 'key'.
+    Lists are memoized, so repeated positions cost one dict lookup.
+    """
+    moves = _best_moves.get((s, key))
+    if moves is None:
+        values = move_values(s, key)
+        moves = _best_moves[s, key] = np.flatnonzero(values == values.max()).tolist()
+    return moves
+
+
+def perfect_move(s, key):
+    """
+    Return an optimal (i,j) move in state s for 'key', chosen at random
+    among equally good moves.
+    """
+    return divmod(random.choice(best_moves(s, key)), 3)
+
+
+def regret(s, key, action):
+    """
+    Return how much worse (0, 1 or 2 result steps) taking 'action' in state s
+    is for 'key' than the best move.
+
+    Parameters
+    ----------
+    action : (i,j) tuple
+        move to score
+    """
+    values = move_values(s, key)
+    return int(values.max()) - int(values[action[0]*3 + action[1]])
@@ -0,0 +1,83 @@
+"""
+Integer encoding of tic-tac-toe boards. The 9 cells are read row by row as
+the digits of a base-3 number ('-' = 0, 'O' = 1, 'X' = 2), so every board maps
+to a unique index in range(3**9) that array-backed tables can use directly.
+"""
+import numpy as np
+
+PIECES = {'-': 0, 'O': 1, 'X': 2}
+N_CELLS = 9
+N_STATES = 3**N_CELLS
+POW3 = [3**i for i in range(N_CELLS)]
+
+# cell contents of every encoded board, shape (N_STATES, N_CELLS)
+BOARDS = ((np.arange(N_STATES)[:, None] // np.array(POW3)) % 3).astype(np.int8)
+# empty cells, i.e. allowed actions, of every encoded board
+LEGAL = BOARDS == 0
+# the same as lists of action indices, for cheap random choice
+LEGAL_MOVES = [np.flatnonzero(legal).tolist() for legal in LEGAL]
+# every board with the 'O' and 'X' stones swapped, i.e. as seen by the
+# other player
+SWAPPED = ((2*BOARDS) % 3).dot(np.array(POW3))
+
+# The 8 rotations and reflections of the board as cell permutations: the
+# board transformed by g has board[SYMMETRIES[g][i]] in cell i, and cell k
+# of the original board lands in cell INVERSE_SYMMETRIES[g][k].
+_cells = np.arange(N_CELLS).reshape(3, 3)
+SYMMETRIES = np.array([np.rot90(_cells, k).ravel() for k in range(4)] +
+                      [np.rot90(_cells.T, k).ravel() for k in range(4)])
+INVERSE_SYMMETRIES = np.argsort(SYMMETRIES, axis=1)
+# Every board is represented by its smallest-index transformed copy
+_transformed = BOARDS[:, SYMMETRIES].dot(np.array(POW3))
+CANONICAL = _transformed.min(axis=1)
+CANONICAL_SYMMETRY = _transformed.argmin(axis=1)
+# Cells that a symmetry of the board itself maps onto each other (e.g. the
+# four corners of the empty board) are the same move; each cell is
+# represented by the smallest cell of its orbit under the board's stabilizer.
+_stabilizer = _transformed == np.arange(N_STATES)[:, None]
+ACTION_ORBIT = np.where(_stabilizer[:, :, None], INVERSE_SYMMETRIES[None].astype(np.int8),
+                        N_CELLS).min(axis=1)
+
+
+def encode(s):
+    """
+    Converts a state key string into its integer index.
+
+    Parameters
+    ----------
+    s : string
+        state key, as built by getStateKey
+    """
+    return sum(PIECES[elt] * p for elt, p in zip(s, POW3))
+
+
+def state_index(s):
+    """
+    Returns the integer index of a state given either as an index already
+    or as a state key string.
+
+    Parameters
+    ----------
+    s : int or string
+        state
+    """
+    if isinstance(s, str):
+        return encode(s)
+    return s
+
+
+def move_key(key, action, piece):
+    """
+    Returns the index of the state reached by placing 'piece' at 'action'
+    in state 'key'.
+
+    Parameters
+    ----------
+    key : int
+        state index before the move
+    action : (i,j) tuple
+        the cell that is played
+    piece : string
+        token that is placed. Either 'O' or 'X'
+    """
+    return key + POW3[action[0]*3 + action[1]] * PIECES[piece]
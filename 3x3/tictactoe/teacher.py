@@ -1,5 +1,9 @@
 import random
 
+from tictactoe import solver
+from tictactoe.board import board_bits, winning_cell
+from tictactoe.game import getStateKey
+
 class Teacher:
     """ 
     A class to implement a teacher that knows the optimal playing strategy.
@@ -13,42 +17,26 @@ class Teacher:
     level : float 
         teacher ability level. This is a value between 0-1 that indicates the
         probability of making the optimal move at any given time.
+    perfect : boolean
+        whether optimal moves are looked up in the exact solver table instead
+        of following the hand-written strategy below.
     """
 
-    def __init__(self, level=0.9):
+    def __init__(self, level=0.9, perfect=False):
         """
         Ability level determines the probability that the teacher will follow
         the optimal strategy as opposed to choosing a random available move.
         """
         self.ability_level = level
+        self.perfect = perfect
 
     def win(self, board, key='X'):
         """ If we have two in a row and the 3rd is available, take it. """
-        # Check for diagonal wins
-        a = [board[0][0], board[1][1], board[2][2]]
-        b = [board[0][2], board[1][1], board[2][0]]
-        if a.count('-') == 1 and a.count(key) == 2:
-            ind = a.index('-')
-            return ind, ind
-        elif b.count('-') == 1 and b.count(key) == 2:
-            ind = b.index('-')
-            if ind == 0:
-                return 0, 2
-            elif ind == 1:
-                return 1, 1
-            else:
-                return 2, 0
-        # Now check for 2 in a row/column + empty 3rd
-        for i in range(3):
-            c = [board[0][i], board[1][i], board[2][i]]
-            d = [board[i][0], board[i][1], board[i][2]]
-            if c.count('-') == 1 and c.count(key) == 2:
-                ind = c.index('-')
-                return ind, i
-            elif d.count('-') == 1 and d.count(key) == 2:
-                ind = d.index('-')
-                return i, ind
-        return None
+        o, x = board_bits(board)
+        cell = winning_cell(x, o) if key == 'X' else winning_cell(o, x)
+        if cell is None:
+            return None
+        return divmod(cell, 3)
 
     def blockWin(self, board):
         """ Block the opponent if she has a win available. """
@@ -115,7 +103,7 @@ class Teacher:
             elif board[1][1] == '-' and board[1][0] == '-' and board[2][1] == '-':
                 return 1, 1
         # Check all cross corners (first check for double fork opp using the corners array)
-        elif corners.count('-') == 1 and corners.count('O') == 2:
+        elif corners.count('-') == 1 and corners.count('O') == 2 and board[1][2] == '-':
             return 1, 2
         elif board[0][0] == 'O' and board[2][2] == 'O':
             if board[1][0] == '-' and board[2][1] == '-' and board[2][0] == '-':
@@ -178,22 +166,33 @@ class Teacher:
                     possibles += [(i, j)]
         return possibles[random.randint(0, len(possibles)-1)]
 
-    def makeMove(self, board):
+    def makeMove(self, board, key=None):
         """
         Trainer goes through a hierarchy of moves, making the best move that
         is currently available each time. A touple is returned that represents
         (row, col).
+
+        Parameters
+        ----------
+        board : list of lists
+            the current game board
+        key : int
+            integer state key of the board, if already known
         """
         # Chose randomly with some probability so that the teacher does not always win
         if random.random() > self.ability_level:
             return self.randomMove(board)
-        # Follow optimal strategy
-        a = self.win(board)
-        if a is not None:
-            return a
-        a = self.blockWin(board)
-        if a is not None:
-            return a
+        if self.perfect:
+            if key is None:
+                key = getStateKey(board)
+            return solver.perfect_move(key, 'X')
+        # Follow optimal strategy: win, or else block the opponent's win
+        o, x = board_bits(board)
+        cell = winning_cell(x, o)
+        if cell is None:
+            cell = winning_cell(o, x)
+        if cell is not None:
+            return divmod(cell, 3)
         a = self.fork(board)
         if a is not None:
             return a
@@ -0,0 +1,54 @@
+from gomoku_game import GomokuEnv, draw_grid, display_grid
+from utils import load_inference_agent, agent_input
+import argparse
+import numpy as np
+
+
+def agent_play(agent1_name, agent2_name, width, win_reward=500,
+			   lose_reward=-1000, even_reward=-100,
+			   keepgoing_reward=-10):
+	"""Load two agents and let them play against each other"""
+	agent1 = load_inference_agent(agent1_name)
+	agent2 = load_inference_agent(agent2_name)
+	play_game(agent1, agent2, width, win_reward, lose_reward,
+			  even_reward, keepgoing_reward)
+
+
+def play_game(agent1, agent2, width, win_reward, lose_reward,
+			  even_reward, keepgoing_reward):
+	"""agents will take the move with the highest Q value"""
+	env = GomokuEnv(width, win_reward, lose_reward, even_reward, keepgoing_reward)
+	state = env.reset()
+	agents = [agent1, agent2]
+
+	# while game still in progress
+	done = False
+	step = 0
+
+	while not done:
+		actor = env.player
+		step += 1
+		qval = agents[actor].predict(agent_input(agents[actor], state))
+
+		# policy: choose the move with the max Q value
+		action = (np.argmax(qval + env.available.reshape(1, width**2)))
+		action = int(action / width), (action % width)
+		print('Move #: %s; Actor %s, taking action: %s' %
+			  (step, actor, action))
+
+		state, reward, done, _ = env.step(action)
+		display_grid(draw_grid(state))
+
+		if done:
+			print("Reward: %s" % (reward,))
+		elif actor == 1:
+			input()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--filename1', type=str, required=True)
+	parser.add_argument('--filename2', type=str, required=True)
+	parser.add_argument('--width', type=int, default=11)
+	args = parser.parse_args()
+	agent_play(args.filename1, args.filename2, args.width)
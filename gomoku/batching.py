@@ -0,0 +1,92 @@
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+"""
+	Micro-batching scheduler around one Q-network (from utils.init_agent,
+	init_conv_agent or load_agent). Callers on any thread submit single
+	inputs; a worker thread queues them and runs one predict_on_batch call
+	as soon as max_batch_size requests are waiting, or max_wait seconds after
+	the oldest one arrived, then hands each caller its row of Q values.
+	Inputs of different shapes (conv agents on different board widths) are
+	batched separately. model can also be a function returning the network
+	(e.g. a registry lookup), called once per batch, so the scheduler does
+	not keep it loaded.
+"""
+class BatchScheduler(object):
+	def __init__(self, model, max_batch_size=64, max_wait=0.002):
+		self.model = model if not hasattr(model, 'predict_on_batch') else (lambda: model)
+		self.max_batch_size = max_batch_size
+		self.max_wait = max_wait
+		self.queue = queue.Queue()
+		self.batches = 0
+		self.requests = 0
+		self.closed = False
+		self.worker = threading.Thread(target=self._loop, daemon=True)
+		self.worker.start()
+
+	# queue one input, laid out as agent_input(model, state)[0]; returns a Future of its Q values
+	def submit(self, x):
+		if self.closed:
+			raise RuntimeError("the scheduler is closed")
+		future = Future()
+		self.queue.put((np.asarray(x), future))
+		return future
+
+	# drop-in for model.predict on a batch of inputs, e.g. agent_input(agent, state)
+	def predict(self, x):
+		futures = [self.submit(row) for row in x]
+		return np.stack([future.result() for future in futures])
+
+	def close(self):
+		self.closed = True
+		self.queue.put(None)
+		self.worker.join()
+
+	def _collect(self):
+		item = self.queue.get()
+		if item is None:
+			return None
+		items = [item]
+		deadline = time.perf_counter() + self.max_wait
+		while len(items) < self.max_batch_size:
+			timeout = deadline - time.perf_counter()
+			if timeout <= 0:
+				break
+			try:
+				item = self.queue.get(timeout=timeout)
+			except queue.Empty:
+				break
+			if item is None:
+				# flush what is queued, then stop
+				self.queue.put(None)
+				break
+			items.append(item)
+		return items
+
+	def _loop(self):
+		while True:
+			items = self._collect()
+			if items is None:
+				return
+			groups = {}
+			for x, future in items:
+				groups.setdefault(x.shape, []).append((x, future))
+			for group in groups.values():
+				self._run(group)
+
+	def _run(self, items):
+		try:
+			qvals = np.asarray(self.model().predict_on_batch(np.stack([x for x, _ in items])))
+		except Exception as e:
+			for _, future in items:
+				future.set_exception(e)
+			return
+		self.batches += 1
+		self.requests += len(items)
+		for (_, future), qval in zip(items, qvals):
+			future.set_result(qval)
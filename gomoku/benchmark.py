@@ -0,0 +1,144 @@
+from gomoku_game import init_game, make_move, win_game, get_reward
+from utils import init_agent, agent_input, compute_Q, check_exp, ReplayBuffer, set_seed
+from presets import PRESETS, build_paras
+from train import training
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+import tensorflow as tf
+
+
+# best time per call over `repeat` rounds of `number` calls
+def time_call(fn, number, repeat=5):
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for _ in range(number):
+			fn()
+		best = min(best, (time.perf_counter() - start) / number)
+	return best
+
+
+# a board with a third of the cells taken, players alternating
+def random_board(width):
+	state, available = init_game(width)
+	cells = np.random.permutation(width**2)[:width**2 // 3]
+	for k, cell in enumerate(cells):
+		state, available = make_move(state, available, divmod(int(cell), width), k % 2)
+	return state, available
+
+
+def micro_benchmarks(preset, number):
+	"""per-call time of the hot functions of one move, in microseconds"""
+	paras = build_paras(preset)
+	width = paras['width']
+	state, available = random_board(width)
+	agents = [init_agent(paras['hidden_size'], paras['layer_num'], paras['lr'], width) for _ in range(2)]
+	new_state, new_available = make_move(state, available, tuple(np.argwhere(available == 0)[0]), 0)
+
+	input_shape = agent_input(agents[0], state)[0].shape
+	memory = [ReplayBuffer(paras['buffersize'], input_shape, width) for _ in agents]
+	X = agent_input(agents[0], state)[0]
+	while not memory[0].full():
+		memory[0].add(X, 0, 0., new_state, new_available, False)
+	transition = (X, 0, 0., new_state, new_available, False)
+	# the boards of one replayed minibatch
+	batch_state = np.repeat(new_state[None], paras['batch_size'], axis=0)
+	batch_available = np.repeat(new_available[None], paras['batch_size'], axis=0)
+
+	calls = {
+		'win_game': (lambda: win_game(state[:, :, 0], 0), number),
+		'make_move': (lambda: make_move(state, available, tuple(np.argwhere(available == 0)[0]), 0), number),
+		'get_reward': (lambda: get_reward(state, 0), number),
+		'check_exp': (lambda: check_exp(memory, 0, transition, paras['batch_size']), number),
+		'predict': (lambda: agents[0].predict_on_batch(agent_input(agents[0], state)), max(1, number // 100)),
+		'compute_Q_batch': (lambda: compute_Q(agents, 0, batch_state, batch_available), max(1, number // 1000)),
+	}
+	return {'{}[{}]'.format(name, preset): {'value': 1e6 * time_call(fn, n), 'unit': 'us/call',
+											 'higher_is_better': False}
+			for name, (fn, n) in calls.items()}
+
+
+def training_throughput(preset, epochs):
+	"""moves and fits per second of train.training, from its metrics file.
+	The replay buffer holds a single minibatch so that it fills within the
+	first games; the epochs before the first fit are left out as warm-up"""
+	paras = build_paras(preset, {'epoch': epochs, 'metrics_file': 'metrics.jsonl'})
+	paras['buffersize'] = paras['batch_size']
+	agent1 = init_agent(paras['hidden_size'], paras['layer_num'], paras['lr'], paras['width'])
+	agent2 = init_agent(paras['hidden_size'], paras['layer_num'], paras['lr'], paras['width'])
+	with tempfile.TemporaryDirectory() as save_path:
+		training(agent1, agent2, paras, save_path)
+		with open(os.path.join(save_path, 'metrics.jsonl')) as fin:
+			records = [json.loads(line) for line in fin]
+
+	fitted = [k for k, r in enumerate(records) if r['fits']]
+	if not fitted:
+		raise RuntimeError("no replay fits in {} epochs of {}; raise --epochs".format(epochs, preset))
+	records = records[fitted[0]:]
+	seconds = sum(r['seconds'] for r in records)
+	return {'training_moves_per_s[{}]'.format(preset): {'value': sum(r['moves'] for r in records) / seconds,
+														 'unit': 'moves/s', 'higher_is_better': True},
+			'training_fits_per_s[{}]'.format(preset): {'value': sum(r['fits'] for r in records) / seconds,
+														'unit': 'fits/s', 'higher_is_better': True}}
+
+
+# print the ratio of each result to the baseline; returns the names of regressions
+def compare(results, baseline, tolerance):
+	regressions = []
+	print('{:<32} {:>14} {:>14} {:>8}'.format('benchmark', 'baseline', 'current', 'change'))
+	for name, result in results.items():
+		if name not in baseline:
+			print('{:<32} {:>14} {:>14.3f} {:>8}'.format(name, '-', result['value'], 'new'))
+			continue
+		old, new = baseline[name]['value'], result['value']
+		# positive change = faster
+		change = (new / old - 1.) if result['higher_is_better'] else (old / new - 1.)
+		flag = ''
+		if change < -tolerance:
+			flag = ' REGRESSION'
+			regressions.append(name)
+		print('{:<32} {:>14.3f} {:>14.3f} {:>+7.1%}{}'.format(name, old, new, change, flag))
+	return regressions
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--preset', type=str, nargs='+', default=sorted(PRESETS), choices=sorted(PRESETS))
+	parser.add_argument('--number', type=int, default=1000, help='calls per round of the fast micro-benchmarks')
+	parser.add_argument('--epochs', type=int, default=5, help='training epochs per throughput run')
+	parser.add_argument('--seed', type=int, default=17)
+	parser.add_argument('--out', type=str, default='benchmark_results.json')
+	parser.add_argument('--baseline', type=str, default=None, help='results file to compare against')
+	parser.add_argument('--tolerance', type=float, default=0.1,
+						help='slowdown relative to the baseline reported as a regression')
+	args = parser.parse_args()
+
+	set_seed(args.seed)
+
+	results = {}
+	for preset in args.preset:
+		results.update(micro_benchmarks(preset, args.number))
+		results.update(training_throughput(preset, args.epochs))
+
+	report = {'meta': {'seed': args.seed, 'python': platform.python_version(), 'numpy': np.__version__,
+					   'tensorflow': tf.__version__, 'machine': platform.machine(),
+					   'time': time.strftime('%Y-%m-%d %H:%M:%S')},
+			  'results': results}
+	with open(args.out, 'w') as fout:
+		json.dump(report, fout, indent=1)
+	print('Results written to {}'.format(args.out))
+
+	if args.baseline:
+		with open(args.baseline) as fin:
+			baseline = json.load(fin)['results']
+		if compare(results, baseline, args.tolerance):
+			raise SystemExit(1)
+	else:
+		for name, result in results.items():
+			print('{:<32} {:>14.3f} {}'.format(name, result['value'], result['unit']))
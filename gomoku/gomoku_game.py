@@ -0,0 +1,198 @@
+import numpy as np 
+
+from profiling import NO_TIMER
+
+
+def init_game(width):
+	state = np.zeros((width, width, 2))
+	available = np.zeros((width, width))
+	return state, available
+
+
+# specify the actor and the location of the new stone
+def make_move(state, available, action, player):
+	state_ret = state.copy()
+	available_ret = available.copy()
+	state_ret[action][player] = player+1
+	available_ret[action] = float("-inf")
+	return state_ret, available_ret
+
+
+# five stones in a row horizontally, vertically or diagonally (down-right)
+# stones: boolean array of shape (..., width, width); one result per board
+def five_in_row(stones):
+	width = stones.shape[-1]
+	if width < 5:
+		return np.zeros(stones.shape[:-2], dtype=bool)
+
+	stones = stones.astype(np.int8)
+	span = width - 4
+	horizontal = sum(stones[..., :, k: k+span] for k in range(5))
+	vertical = sum(stones[..., k: k+span, :] for k in range(5))
+	diagonal = sum(stones[..., k: k+span, k: k+span] for k in range(5))
+	return ((horizontal == 5).any(axis=(-2, -1)) | (vertical == 5).any(axis=(-2, -1))
+			| (diagonal == 5).any(axis=(-2, -1)))
+
+
+# check if the game winning criteria is met
+def win_game(sub_state, player):
+	return bool(five_in_row(sub_state == (player+1)))
+
+
+# check if the chessboard is full
+def full_grid(state):
+	return not ((state[:, :, 0] + state[:, :, 1]) == 0).any()
+
+
+# calculate the reward given to whom just moved
+def get_reward(state, whose_turn, win_reward=500, lose_reward=-1000,
+					even_reward=-100, keepgoing_reward=-10):
+	reward = [0, 0]
+	if win_game(state[:, :, whose_turn], whose_turn):
+		reward[whose_turn] = win_reward
+		reward[1 - whose_turn] = lose_reward
+	elif full_grid(state):
+		reward = [even_reward, even_reward]
+	else:
+		reward[whose_turn] = keepgoing_reward
+
+	return reward
+
+
+class GomokuEnv(object):
+	"""One Gomoku board with a reset()/step() interface.
+	Players take turns, player 0 first; rewards are [player 0, player 1]
+	as given by get_reward. An optional profiling.PhaseTimer times the
+	make_move and get_reward phases of each step"""
+	def __init__(self, width, win_reward=500, lose_reward=-1000,
+				 even_reward=-100, keepgoing_reward=-10, timer=NO_TIMER):
+		self.width = width
+		self.rewards = (win_reward, lose_reward, even_reward, keepgoing_reward)
+		self.timer = timer
+		self.reset()
+
+	def reset(self):
+		self.state, self.available = init_game(self.width)
+		self.player = 0
+		self.done = False
+		return self.state
+
+	def step(self, action):
+		"""action is a (row, col) tuple or a flat index; returns (state, reward, done, info)"""
+		if self.done:
+			raise ValueError("The game is over; call reset() first")
+		if not isinstance(action, tuple):
+			action = divmod(int(action), self.width)
+		if not all(0 <= k < self.width for k in action):
+			raise ValueError("Illegal move: {} is off the board".format(action))
+		if self.available[action] != 0:
+			raise ValueError("Illegal move: the place is already taken")
+
+		player = self.player
+		with self.timer('make_move'):
+			self.state, self.available = make_move(self.state, self.available, action, player)
+		with self.timer('get_reward'):
+			reward = get_reward(self.state, player, *self.rewards)
+		self.done = reward[player] != self.rewards[3]
+		self.player = 1 - player
+
+		return self.state, reward, self.done, {'player': player, 'action': action}
+
+
+class VectorGomokuEnv(object):
+	"""num_envs Gomoku boards stepped together with NumPy.
+	state has shape (num_envs, width, width, 2) and is updated in place.
+	Finished boards ignore their actions until they are reset."""
+	def __init__(self, num_envs, width, win_reward=500, lose_reward=-1000,
+				 even_reward=-100, keepgoing_reward=-10):
+		self.num_envs = num_envs
+		self.width = width
+		self.win_reward = win_reward
+		self.lose_reward = lose_reward
+		self.even_reward = even_reward
+		self.keepgoing_reward = keepgoing_reward
+		self.state = np.zeros((num_envs, width, width, 2))
+		self.available = np.zeros((num_envs, width, width))
+		self.player = np.zeros(num_envs, dtype=np.int64)
+		self.done = np.zeros(num_envs, dtype=bool)
+
+	def reset(self, indices=None):
+		"""reset all boards, or only the given ones"""
+		if indices is None:
+			indices = slice(None)
+		self.state[indices] = 0
+		self.available[indices] = 0
+		self.player[indices] = 0
+		self.done[indices] = False
+		return self.state
+
+	def step(self, actions):
+		"""actions: flat move index per board; returns (state, reward, done, info)
+		with reward of shape (num_envs, 2)"""
+		actions = np.asarray(actions)
+		rows = np.flatnonzero(~self.done)
+		i, j = np.divmod(actions[rows], self.width)
+		player = self.player[rows]
+
+		if (self.available[rows, i, j] != 0).any():
+			raise ValueError("Illegal move: the place is already taken")
+		self.state[rows, i, j, player] = player + 1
+		self.available[rows, i, j] = float("-inf")
+
+		stones = self.state[rows, :, :, player] == (player + 1)[:, None, None]
+		win = five_in_row(stones)
+		full = ~(self.available[rows] == 0).any(axis=(1, 2))
+
+		reward = np.zeros((self.num_envs, 2))
+		reward[rows, player] = np.where(win, self.win_reward,
+										np.where(full, self.even_reward, self.keepgoing_reward))
+		reward[rows, 1 - player] = np.where(win, self.lose_reward,
+											np.where(full, self.even_reward, 0))
+
+		self.done[rows] = win | full
+		self.player[rows] = 1 - player
+
+		return self.state, reward, self.done.copy(), {'player': player, 'moved': rows}
+
+
+def draw_grid(state):
+	"""visualize the chessboard"""
+	grid = np.zeros(state.shape[:2], dtype='<U2')
+	grid[:] = ' '
+
+	for i in range(state.shape[0]):
+		for j in range(state.shape[1]):
+
+			if (state[(i, j)] > 0).any():
+
+				if (state[(i, j)] == 1).all():
+					raise
+
+				elif state[(i, j)][0] == 1:
+					grid[(i, j)] = 'O'
+
+				else:
+					grid[(i, j)] = 'X'
+
+	return grid
+
+
+def display_grid(grid):
+	"""print out the chessboard"""
+	wid = grid.shape[0]
+	show_num = 9 if wid > 9 else wid
+
+	# chessboard
+	line = '\n' + '- + ' * (wid - 1) + '- {}\n'
+	line = line.join([' | '.join(grid[i]) for i in range(wid)])
+
+	# mark the number of its lines
+	bottom = ('\n' + '  {} ' * show_num)
+	bottom = bottom.format(*[i+1 for i in range(show_num)])
+
+	if show_num == 9:
+		part = (' {} '*(wid - show_num))
+		part = part.format(*[i+1 for i in range(show_num, wid)])
+		bottom += part
+
+	print(line.format(*[i+1 for i in range(wid)]) + bottom)
\ No newline at end of file
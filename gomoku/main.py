@@ -0,0 +1,77 @@
+import numpy as np
+import argparse
+import sys
+import os
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from train import train_agents
+from presets import PRESETS, build_paras, load_config_file
+from utils import set_seed, derive_seed
+# import keras
+import tensorflow.keras as keras
+
+os.environ['CUDA_VISIBLE_DEVICES'] = '0'
+
+
+def run(paras, v, seed=True):
+	save_path = "./output/{}/epoch_{}".format(v, paras['epoch'])
+	if not os.path.exists(save_path):
+		os.makedirs(save_path)
+	if seed:
+		set_seed(paras['seed'], paras['deterministic'])
+	train_agents(paras, paras['new'], save_path)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--new', type=ast.literal_eval, default=True)
+	parser.add_argument('--epoch', type=int, default=None)
+	parser.add_argument('--v', type=str, default='v_1')
+	parser.add_argument('--network', type=str, default=None, choices=['dense', 'conv'])
+	parser.add_argument('--preset', type=str, nargs='+', default=['5x5'], choices=sorted(PRESETS))
+	parser.add_argument('--profile', type=str, default=None, choices=['cprofile', 'tensorboard'],
+						help='profile the epochs from profile_start for profile_epochs epochs')
+	parser.add_argument('--seed', type=int, default=None, help='run seed (17 unless set in the config)')
+	parser.add_argument('--deterministic', action='store_true', help='use deterministic TF ops')
+	parser.add_argument('--config', type=str, default=None,
+						help='JSON file whose keys override the preset paras')
+	args = parser.parse_args()
+
+	overrides = load_config_file(args.config) if args.config else {}
+	overrides['new'] = args.new
+	if args.epoch is not None:
+		overrides['epoch'] = args.epoch
+	if args.network is not None:
+		overrides['network'] = args.network
+	if args.profile is not None:
+		overrides['profile'] = args.profile
+	if args.seed is not None:
+		overrides['seed'] = args.seed
+	if args.deterministic:
+		overrides['deterministic'] = True
+
+	if len(args.preset) == 1:
+		run(build_paras(args.preset[0], overrides), args.v)
+	else:
+		# each board size gets its own seed derived from the run seed
+		runs = []
+		for k, preset in enumerate(args.preset):
+			paras = build_paras(preset, overrides)
+			paras['seed'] = derive_seed(paras['seed'], k)
+			runs.append((paras, "{}_{}".format(args.v, preset)))
+
+		if runs[0][0]['deterministic']:
+			# the RNGs are global, so only runs one after another are reproducible
+			for paras, v in runs:
+				run(paras, v)
+		else:
+			# train every board size side by side in this process; reseeding the
+			# global RNGs in one thread would disturb the others, so seed once here
+			if 'seed' in overrides:
+				print('warning: with several presets, --seed only makes the runs reproducible '
+					  'together with --deterministic', file=sys.stderr)
+			set_seed(runs[0][0]['seed'])
+			with ThreadPoolExecutor(max_workers=len(runs)) as pool:
+				jobs = [pool.submit(run, paras, v, False) for paras, v in runs]
+				for job in jobs:
+					job.result()
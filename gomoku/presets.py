@@ -0,0 +1,43 @@
+import copy
+import json
+
+
+# settings shared by every board size
+BASE_PARAS = {'agent_name_1': 'agent_1', 'agent_name_2': 'agent_2', 'epoch': 100,
+			'gamma': 0.9, 'gamma2': 0.9, 'lr': 1e-4, 'epsilon': 0.8,
+			'win_reward': 500, 'lose_reward': -500, 'even_reward': -100, 'keepgoing_reward': -10,
+			'buffersize': 100, 'batch_size': 32, 'network': 'dense', 'filters': 64, 'kernel_size': 3,
+			'target_update': 0, 'tau': 1.,
+			# re-randomize the output layer every 100 epochs when target_update is 0
+			'reinit_output': False,
+			# run seed of every RNG; deterministic also makes the TF ops deterministic
+			'seed': 17, 'deterministic': False,
+			# per-epoch phase timings, relative to the save path; .csv or .jsonl
+			'metrics_file': 'metrics.jsonl', 'profile_phases': True,
+			# optional 'cprofile' or 'tensorboard' trace of profile_epochs epochs
+			'profile': None, 'profile_start': 1, 'profile_epochs': 1
+	}
+
+# the parts that differ between board sizes
+PRESETS = {
+	'5x5': {'layer_num': 2, 'hidden_size': 256, 'width': 5},
+	'10x10': {'layer_num': 4, 'hidden_size': 768, 'width': 10},
+}
+
+
+def load_config_file(filename):
+	"""Read paras overrides from a JSON file"""
+	with open(filename, 'r') as fin:
+		return json.load(fin)
+
+
+def build_paras(preset, overrides=None):
+	"""Merge the shared settings, a board-size preset and user overrides"""
+	if preset not in PRESETS:
+		raise ValueError("Unknown preset {}; choose from {}".format(preset, sorted(PRESETS)))
+
+	paras = copy.deepcopy(BASE_PARAS)
+	paras.update(PRESETS[preset])
+	if overrides:
+		paras.update(overrides)
+	return paras
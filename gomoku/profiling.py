@@ -0,0 +1,132 @@
+from contextlib import contextmanager, nullcontext
+import cProfile
+import csv
+import json
+import os
+import pstats
+import time
+
+
+# phases timed in the training loop, in the order of a move
+PHASES = ['select', 'make_move', 'get_reward', 'check_exp', 'sample', 'compute_Q', 'fit', 'save']
+
+
+"""
+	Accumulates wall time per phase and event counters, and turns them
+	into one metrics record per epoch. A disabled timer costs one call and
+	a shared no-op context per phase.
+"""
+class PhaseTimer(object):
+	def __init__(self, enabled=True):
+		self.enabled = enabled
+		self.reset()
+
+	def reset(self):
+		self.seconds = dict.fromkeys(PHASES, 0.)
+		self.counts = {'moves': 0, 'fits': 0, 'samples': 0}
+		self.start = time.perf_counter()
+
+	def __call__(self, phase):
+		if not self.enabled:
+			return _NULL
+		return self._time(phase)
+
+	@contextmanager
+	def _time(self, phase):
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.seconds[phase] = self.seconds.get(phase, 0.) + time.perf_counter() - start
+
+	def count(self, event, n=1):
+		self.counts[event] = self.counts.get(event, 0) + n
+
+	# metrics of the epoch since the last reset, then start the next one
+	def epoch_record(self, **fields):
+		elapsed = time.perf_counter() - self.start
+		record = dict(fields)
+		record['seconds'] = elapsed
+		record.update(self.counts)
+		record['moves_per_s'] = self.counts['moves'] / elapsed if elapsed > 0 else 0.
+		record['fits_per_s'] = self.counts['fits'] / elapsed if elapsed > 0 else 0.
+		# time to draw one replay minibatch from the buffer, nothing else
+		record['sample_ms'] = (1000. * self.seconds['sample'] / self.counts['samples']
+							   if self.counts['samples'] else 0.)
+		for phase, seconds in self.seconds.items():
+			record[phase + '_s'] = seconds
+		self.reset()
+		return record
+
+
+_NULL = nullcontext()
+NO_TIMER = PhaseTimer(enabled=False)
+
+
+"""
+	Appends per-epoch metrics records to a JSONL file, or to a CSV file if
+	the name ends with .csv
+"""
+class MetricsWriter(object):
+	def __init__(self, path):
+		self.path = path
+		self.fields = None
+		if os.path.exists(path):
+			os.remove(path)
+
+	def write(self, record):
+		with open(self.path, 'a', newline='') as fout:
+			if self.path.endswith('.csv'):
+				writer = csv.DictWriter(fout, fieldnames=self.fields or list(record), extrasaction='ignore')
+				if self.fields is None:
+					self.fields = list(record)
+					writer.writeheader()
+				writer.writerow(record)
+			else:
+				fout.write(json.dumps(record) + '\n')
+
+
+"""
+	Profiles a window of epochs, either with cProfile (stats saved to
+	{save_path}/profile.prof and the top functions printed) or with the
+	TensorFlow profiler (a trace for TensorBoard in {save_path}/trace).
+"""
+class ProfileWindow(object):
+	def __init__(self, mode, start, epochs, save_path):
+		if mode not in (None, 'cprofile', 'tensorboard'):
+			raise ValueError("Unknown profile mode {}; choose cprofile or tensorboard".format(mode))
+		self.mode = mode
+		self.start = start
+		self.stop = start + epochs
+		self.save_path = save_path
+		self.profiler = None
+		self.active = False
+
+	def begin_epoch(self, epoch):
+		if self.mode is None or epoch != self.start:
+			return
+		if self.mode == 'cprofile':
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
+		else:
+			import tensorflow as tf
+			tf.profiler.experimental.start(os.path.join(self.save_path, 'trace'))
+		self.active = True
+
+	def end_epoch(self, epoch):
+		if epoch + 1 == self.stop:
+			self.close()
+
+	# also called when training ends inside the window
+	def close(self):
+		if not self.active:
+			return
+		if self.mode == 'cprofile':
+			self.profiler.disable()
+			path = os.path.join(self.save_path, 'profile.prof')
+			self.profiler.dump_stats(path)
+			pstats.Stats(path).sort_stats('cumulative').print_stats(20)
+		else:
+			import tensorflow as tf
+			tf.profiler.experimental.stop()
+		self.active = False
@@ -0,0 +1,90 @@
+from utils import load_inference_agent
+from collections import OrderedDict
+import os
+import re
+import threading
+
+
+"""
+	Index of the agents saved by train.training under
+	{root}/{v}/epoch_{N}/{name}.pkl, where v is the version (or
+	{version}_{preset}) and name is e.g. agent_1 (final weights) or
+	agent_1_200 (checkpoint after game 200). Agents are referred to by
+	"{v}/epoch_{N}/{name}" or by file path.
+
+	Loaded networks are kept in an LRU cache, loaded for inference only
+	(no optimizer is compiled). Once the weights of the cached networks
+	exceed max_bytes, the least recently used ones are dropped.
+"""
+class ModelRegistry(object):
+	def __init__(self, root='./output', max_bytes=512 * 2**20):
+		self.root = root
+		self.max_bytes = max_bytes
+		self.cache = OrderedDict()
+		self.cached_bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.lock = threading.Lock()
+		self.entries = {}
+		self.refresh()
+
+	# rescan the output directory for saved agents
+	def refresh(self):
+		entries = {}
+		if os.path.isdir(self.root):
+			for v in sorted(os.listdir(self.root)):
+				# skip stray files next to the version directories
+				if not os.path.isdir(os.path.join(self.root, v)):
+					continue
+				for run in sorted(os.listdir(os.path.join(self.root, v))):
+					match = re.match(r'epoch_(\d+)$', run)
+					run_dir = os.path.join(self.root, v, run)
+					if match is None or not os.path.isdir(run_dir):
+						continue
+					for filename in sorted(os.listdir(run_dir)):
+						if filename.endswith('.pkl'):
+							name = filename[:-len('.pkl')]
+							entries['{}/{}/{}'.format(v, run, name)] = os.path.join(run_dir, filename)
+		self.entries = entries
+		return entries
+
+	# keys of the indexed agents, optionally only those of one version
+	def keys(self, v=None):
+		return [key for key in self.entries if v is None or key.split('/')[0] == v]
+
+	# key of the final agent `name` of the longest run of version v
+	def latest(self, v, name='agent_1'):
+		runs = [key for key in self.keys(v) if key.split('/')[2] == name]
+		if not runs:
+			raise KeyError("no agent {} saved for {}".format(name, v))
+		return max(runs, key=lambda key: int(key.split('/')[1][len('epoch_'):]))
+
+	def path(self, key):
+		if key in self.entries:
+			return self.entries[key]
+		if os.path.isfile(key):
+			return key
+		raise KeyError("unknown agent: {}".format(key))
+
+	def get(self, key):
+		path = os.path.abspath(self.path(key))
+		with self.lock:
+			if path in self.cache:
+				self.hits += 1
+				self.cache.move_to_end(path)
+				return self.cache[path][0]
+			self.misses += 1
+
+			model = load_inference_agent(path)
+			size = sum(w.nbytes for w in model.get_weights())
+			self.cache[path] = (model, size)
+			self.cached_bytes += size
+			# evict least recently used networks, always keeping the new one
+			while self.cached_bytes > self.max_bytes and len(self.cache) > 1:
+				_, (_, evicted) = self.cache.popitem(last=False)
+				self.cached_bytes -= evicted
+			return model
+
+	def stats(self):
+		return {'indexed': len(self.entries), 'cached': len(self.cache),
+				'cached_bytes': self.cached_bytes, 'hits': self.hits, 'misses': self.misses}
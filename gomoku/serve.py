@@ -0,0 +1,243 @@
+from gomoku_game import GomokuEnv, draw_grid, win_game
+from registry import ModelRegistry
+from batching import BatchScheduler
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+
+# board widths a game with a conv agent may ask for; five in a row needs at least 5
+MIN_WIDTH, MAX_WIDTH = 5, 25
+
+
+class Game(object):
+	"""One game between a client and an agent"""
+	def __init__(self, agent, width, human_actor):
+		self.agent = agent
+		self.env = GomokuEnv(width)
+		self.human_actor = human_actor
+
+	def to_dict(self, game_id):
+		env = self.env
+		return {'game': game_id, 'agent': self.agent, 'width': env.width,
+				'human_actor': self.human_actor, 'to_move': env.player, 'done': env.done,
+				'grid': [''.join(c if c != ' ' else '.' for c in row) for row in draw_grid(env.state)]}
+
+
+class GomokuServer(object):
+	"""Plays any number of games over a small JSON/HTTP API. agents maps names to registry
+	keys; each move fetches its network from the registry, whose LRU cache bounds memory:
+		GET    /agents            names of the loaded agents
+		POST   /games             {"agent": name, "width": w, "human_first": true}
+		POST   /games/<id>/move   {"move": [row, col]}; the agent replies in the same call
+		DELETE /games/<id>
+		GET    /stats             per-move latency percentiles and batching counters"""
+	def __init__(self, registry, agents, max_batch_size=64, max_wait=0.002, latency_window=10000):
+		self.registry = registry
+		self.agents = agents
+		self.schedulers = {name: BatchScheduler(lambda key=key: registry.get(key), max_batch_size, max_wait)
+						   for name, key in agents.items()}
+		# input layout of each agent, read once here: registry lookups may load from
+		# disk, so the event loop leaves them to the schedulers' worker threads
+		self.input_shapes = {name: tuple(registry.get(key).input_shape) for name, key in agents.items()}
+		self.games = {}
+		self.ids = itertools.count(1)
+		self.latencies = deque(maxlen=latency_window)
+
+	# width of the board a dense agent was trained on; conv agents take any width
+	def agent_width(self, name):
+		input_shape = self.input_shapes[name]
+		if len(input_shape) == 4:
+			return None
+		return int(round(np.sqrt(input_shape[-1] / 2)))
+
+	# one board laid out as agent_input(model, state)[0] for the agent's network
+	def agent_input(self, name, state):
+		if len(self.input_shapes[name]) == 4:
+			return state
+		return state.ravel()
+
+	async def agent_move(self, game):
+		env = game.env
+		scheduler = self.schedulers[game.agent]
+		qval = await asyncio.wrap_future(scheduler.submit(self.agent_input(game.agent, env.state)))
+		action = int(np.argmax(qval + env.available.ravel()))
+		env.step(action)
+		return divmod(action, env.width)
+
+	def result(self, game, reply):
+		env = game.env
+		if env.done:
+			# the player who moved last either won or filled the board
+			last = 1 - env.player
+			reply['winner'] = last if win_game(env.state[:, :, last], last) else None
+		return reply
+
+	async def new_game(self, payload):
+		name = payload.get('agent', next(iter(self.agents)))
+		if name not in self.agents:
+			raise KeyError("unknown agent: {}".format(name))
+		width = self.agent_width(name)
+		if width is None:
+			width = int(payload.get('width', 11))
+			if not MIN_WIDTH <= width <= MAX_WIDTH:
+				raise ValueError("width must be between {} and {}".format(MIN_WIDTH, MAX_WIDTH))
+		human_actor = 0 if payload.get('human_first', True) else 1
+		game_id = next(self.ids)
+		game = self.games[game_id] = Game(name, width, human_actor)
+
+		reply = {}
+		if human_actor == 1:
+			start = time.perf_counter()
+			reply['agent_move'] = await self.agent_move(game)
+			self.latencies.append(time.perf_counter() - start)
+		reply.update(game.to_dict(game_id))
+		return reply
+
+	async def move(self, game_id, payload):
+		start = time.perf_counter()
+		game = self.games[game_id]
+		env = game.env
+		if env.done:
+			raise ValueError("the game is over")
+		if env.player != game.human_actor:
+			raise ValueError("it is the agent's turn")
+		move = payload.get('move')
+		if not isinstance(move, list) or len(move) != 2:
+			raise ValueError('expected {"move": [row, col]}')
+		action = tuple(int(k) for k in move)
+		if not all(0 <= k < env.width for k in action) or env.available[action] != 0:
+			raise ValueError("can't put there")
+		env.step(action)
+
+		reply = {}
+		if not env.done:
+			reply['agent_move'] = await self.agent_move(game)
+			self.latencies.append(time.perf_counter() - start)
+		reply.update(game.to_dict(game_id))
+		if env.done:
+			# the final board is in the reply; finished games are not kept
+			del self.games[game_id]
+		return self.result(game, reply)
+
+	def stats(self):
+		batches = sum(s.batches for s in self.schedulers.values())
+		requests = sum(s.requests for s in self.schedulers.values())
+		reply = {'active_games': len(self.games), 'moves': len(self.latencies),
+				 'batches': batches, 'mean_batch_size': requests / max(1, batches)}
+		if self.latencies:
+			ms = np.array(self.latencies) * 1000.
+			for p in (50, 90, 99):
+				reply['p{}_ms'.format(p)] = float(np.percentile(ms, p))
+			reply['max_ms'] = float(ms.max())
+		reply['registry'] = self.registry.stats()
+		return reply
+
+	async def route(self, method, path, payload):
+		parts = [p for p in path.split('/') if p]
+		if method == 'GET' and parts == ['agents']:
+			return {name: {'width': self.agent_width(name)} for name in self.agents}
+		if method == 'GET' and parts == ['stats']:
+			return self.stats()
+		if method == 'POST' and parts == ['games']:
+			return await self.new_game(payload)
+		if method == 'POST' and len(parts) == 3 and parts[0] == 'games' and parts[2] == 'move':
+			return await self.move(int(parts[1]), payload)
+		if method == 'GET' and len(parts) == 2 and parts[0] == 'games':
+			return self.result(self.games[int(parts[1])], self.games[int(parts[1])].to_dict(int(parts[1])))
+		if method == 'DELETE' and len(parts) == 2 and parts[0] == 'games':
+			del self.games[int(parts[1])]
+			return {}
+		raise LookupError(path)
+
+	# method, path and JSON payload of one request; ValueError if it is malformed
+	async def read_request(self, request_line, reader):
+		words = request_line.decode('latin-1').split()
+		if len(words) != 3:
+			raise ValueError('malformed request line')
+		method, path, _ = words
+		headers = {}
+		while True:
+			line = await reader.readline()
+			if line in (b'\r\n', b'\n', b''):
+				break
+			if b':' not in line:
+				raise ValueError('malformed header')
+			key, value = line.decode('latin-1').split(':', 1)
+			headers[key.strip().lower()] = value.strip()
+		body = await reader.readexactly(int(headers.get('content-length', 0)))
+		payload = json.loads(body) if body else {}
+		if not isinstance(payload, dict):
+			raise ValueError('the request body must be a JSON object')
+		return method, path, payload
+
+	async def handle(self, reader, writer):
+		try:
+			request_line = await reader.readline()
+			if not request_line:
+				return
+
+			# 404 is only for unknown agents, games and paths; anything the
+			# client sent wrong is a 400
+			try:
+				method, path, payload = await self.read_request(request_line, reader)
+				status, reply = '200 OK', await self.route(method, path, payload)
+			except LookupError as e:
+				status, reply = '404 Not Found', {'error': 'not found: {}'.format(e)}
+			except (ValueError, TypeError) as e:
+				status, reply = '400 Bad Request', {'error': str(e)}
+
+			data = json.dumps(reply).encode()
+			writer.write('HTTP/1.1 {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n'
+						 'Connection: close\r\n\r\n'.format(status, len(data)).encode() + data)
+			await writer.drain()
+		finally:
+			writer.close()
+
+
+async def serve(server, host, port, unix=None):
+	if unix:
+		listener = await asyncio.start_unix_server(server.handle, path=unix)
+		print('Serving on {}'.format(unix))
+	else:
+		listener = await asyncio.start_server(server.handle, host, port)
+		print('Serving on http://{}:{}'.format(host, port))
+	async with listener:
+		await listener.serve_forever()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--agent', type=str, action='append', required=True,
+						help='NAME=AGENT of an agent to serve (repeatable); AGENT is a '
+							 'file path or a registry key such as v_1/epoch_100/agent_1')
+	parser.add_argument('--output', type=str, default='./output',
+						help='directory of the trained agents indexed by the registry')
+	parser.add_argument('--cache_mb', type=float, default=512.,
+						help='memory cap of the loaded agent cache')
+	parser.add_argument('--host', type=str, default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=8000)
+	parser.add_argument('--unix', type=str, default=None, help='serve on this Unix socket instead')
+	parser.add_argument('--max_batch_size', type=int, default=64,
+						help='largest number of moves answered by one forward pass')
+	parser.add_argument('--max_wait_ms', type=float, default=2.,
+						help='longest time a move waits for its batch to fill')
+	args = parser.parse_args()
+
+	registry = ModelRegistry(args.output, int(args.cache_mb * 2**20))
+	agents = {}
+	for spec in args.agent:
+		name, _, key = spec.rpartition('=')
+		registry.path(key)
+		agents[name or key] = key
+
+	server = GomokuServer(registry, agents, args.max_batch_size, args.max_wait_ms / 1000.)
+	try:
+		asyncio.run(serve(server, args.host, args.port, args.unix))
+	except KeyboardInterrupt:
+		print(json.dumps(server.stats()))
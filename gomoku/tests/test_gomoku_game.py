@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from gomoku_game import GomokuEnv, VectorGomokuEnv
+
+
+def test_step_rejects_taken_and_off_board_cells():
+	env = GomokuEnv(5)
+	env.step((2, 2))
+	with pytest.raises(ValueError):
+		env.step((2, 2))
+	with pytest.raises(ValueError):
+		env.step((5, 0))
+	# the rejected moves changed nothing
+	assert env.player == 1 and (env.available != 0).sum() == 1
+
+
+@pytest.mark.parametrize('width', [5, 6])
+def test_vector_env_matches_single_envs(width):
+	rng = np.random.RandomState(0)
+	num_envs = 8
+	vector = VectorGomokuEnv(num_envs, width)
+	envs = [GomokuEnv(width) for _ in range(num_envs)]
+	vector.reset()
+
+	while not all(env.done for env in envs):
+		actions = np.zeros(num_envs, dtype=np.int64)
+		for k, env in enumerate(envs):
+			if not env.done:
+				actions[k] = rng.choice(np.flatnonzero(env.available.ravel() == 0))
+
+		state, reward, done, _ = vector.step(actions)
+		for k, env in enumerate(envs):
+			if env.done:
+				assert not reward[k].any()
+				continue
+			single_state, single_reward, single_done, _ = env.step(int(actions[k]))
+			assert np.array_equal(state[k], single_state)
+			assert np.array_equal(vector.available[k], env.available)
+			assert list(reward[k]) == single_reward
+			assert done[k] == single_done
+			assert vector.player[k] == env.player
@@ -0,0 +1,167 @@
+import random
+import numpy as np
+import argparse
+from utils import init_agent, init_conv_agent, agent_input, save_agent, load_agent, check_exp
+from utils import TargetNetwork, ReplayBuffer, replay
+from gomoku_game import init_game, GomokuEnv
+from profiling import PhaseTimer, MetricsWriter, ProfileWindow
+import os
+
+
+def training(agent1, agent2, config, save_path, verb=[0, 0]):
+	agents = [agent1, agent2]
+	input_shape = agent_input(agent1, init_game(config['width'])[0])[0].shape
+	agent_exps = [ReplayBuffer(config['buffersize'], input_shape, config['width']) for _ in agents]
+
+	# optional target networks, synced every `target_update` fits
+	targets = None
+	if config.get('target_update', 0) > 0:
+		targets = [TargetNetwork(agent1), TargetNetwork(agent2)]
+	fits = 0
+
+	# per-phase timers, written as one metrics record per epoch
+	timer = PhaseTimer(config.get('profile_phases', True))
+	metrics = MetricsWriter(os.path.join(save_path, config['metrics_file'])) if config.get('metrics_file') else None
+	window = ProfileWindow(config.get('profile'), config.get('profile_start', 1),
+						   config.get('profile_epochs', 1), save_path)
+
+	# count a fit of either agent and sync the targets every `target_update` fits
+	def count_fit(fits):
+		timer.count('fits')
+		fits += 1
+		if targets is not None and fits % config['target_update'] == 0:
+			for target, online in zip(targets, agents):
+				target.sync(online, config.get('tau', 1.))
+		return fits
+
+	env = GomokuEnv(config['width'], config['win_reward'], config['lose_reward'],
+					config['even_reward'], config['keepgoing_reward'], timer)
+
+	for i in range(config['epoch']):
+		window.begin_epoch(i)
+		state = env.reset()
+		available = env.available
+
+		# start playing
+		count = 0
+		stop = False
+		# the state the rival last moved from
+		state_riv = state
+
+		# play the game
+		while not stop:
+			for player, agent in enumerate(agents):
+				count += 1
+				timer.count('moves')
+				with timer('select'):
+					# predict q value size: [1, width ** 2]
+					qval = agent.predict(agent_input(agent, state))
+					# epsilon greedy to select an action
+					if random.random() < config['epsilon']:
+						while True:
+							x = np.random.randint(config['width'])
+							y = np.random.randint(config['width'])
+							action = (x, y)
+							if available[action] == 0:
+								break
+					else:
+						# add available to avoid taking the place that is already taken
+						index = np.argmax(qval + available.reshape((1, config['width']**2)))
+						action = (int(index / config['width']), index % config['width'])
+
+				# take the action and compute the reward of it
+				new_state, reward, terminal, _ = env.step(action)
+				new_available = env.available
+
+				X = agent_input(agent, state)[0]
+				move = action[0] * config['width'] + action[1]
+
+				# update with experience reply; the target output values y
+				# are computed from the stored boards when replayed
+				minibatch = check_exp(agent_exps, player, (X, move, reward[player], new_state, new_available, terminal),
+									  config['batch_size'], timer)
+
+				if minibatch is not None:
+					timer.count('samples')
+					replay(agents, player, minibatch, config['gamma'], config['gamma2'], config['batch_size'],
+						   targets, verb[0], timer)
+					fits = count_fit(fits)
+
+				# update the rival if necessary, i.e. game terminate:
+				# its last state should have led it to take this move
+				if terminal:
+					X_riv = agent_input(agents[1 - player], state_riv)[0]
+					minibatch = check_exp(agent_exps, 1 - player, (X_riv, move, reward[1 - player], new_state, new_available, True),
+										  config['batch_size'], timer)
+
+					if minibatch is not None:
+						timer.count('samples')
+						replay(agents, 1 - player, minibatch, config['gamma'], config['gamma2'], config['batch_size'],
+							   targets, verb[1], timer)
+						fits = count_fit(fits)
+
+				state_riv = state
+				state, available = new_state, new_available
+
+				# check if the game terminate
+				if terminal or count > config['width']**2 - 2:
+					stop = True
+					break
+
+		if i % 100 == 0:
+			with timer('save'):
+				path_1 = os.path.join(save_path, "{}_{}.pkl".format(config['agent_name_1'], i))
+				save_agent(agent1, path_1)
+				path_2 = os.path.join(save_path, "{}_{}.pkl".format(config['agent_name_2'], i))
+				save_agent(agent2, path_2)
+   
+			# optionally reinitialize the output layer (the last layer with weights) to
+			# keep the targets moving when there are no target networks; this discards
+			# what the output layer has learnt, so it is off unless asked for
+			if i > 0 and targets is None and config.get('reinit_output', False):
+				for model in agents:
+					output = [layer for layer in model.layers if layer.get_weights()][-1]
+					output.set_weights([np.random.randn(*w.shape) * 0.01 for w in output.get_weights()])
+
+		if config['epsilon'] >= 0.1:
+			config['epsilon'] -= 0.7/config['epoch']
+
+		record = timer.epoch_record(epoch=i, steps=count, epsilon=config['epsilon'])
+		if metrics is not None:
+			metrics.write(record)
+		window.end_epoch(i)
+
+		log_msg = 'Epoch: {}, step: {}, moves/s: {:.1f}, fits/s: {:.1f}'.format(
+			i, count, record['moves_per_s'], record['fits_per_s'])
+		print(log_msg)
+
+		# decrease epsilon (prob of random action) every epoch
+		# if epsilon > eps_threshold:
+		# 	epsilon -= 2 / epoch
+
+	window.close()
+	return agent1, agent2
+
+
+def new_agent(config):
+	"""Build an untrained agent of the network type given in the config"""
+	if config.get('network', 'dense') == 'conv':
+		return init_conv_agent(config['filters'], config['layer_num'], config['lr'], config['kernel_size'])
+	return init_agent(config['hidden_size'], config['layer_num'], config['lr'], config['width'])
+
+
+def train_agents(config, new, save_path):
+	"""Create new agents or load existing agents then do training"""
+	if new:
+		agent1 = new_agent(config)
+		agent2 = new_agent(config)
+	else:
+		agent1 = load_agent(config['agent_name_1'])
+		agent2 = load_agent(config['agent_name_2'])
+
+	agent1, agent2 = training(agent1, agent2, config, save_path)
+
+	path_1 = os.path.join(save_path, "{}.pkl".format(config['agent_name_1']))
+	save_agent(agent1, path_1)
+	path_2 = os.path.join(save_path, "{}.pkl".format(config['agent_name_2']))
+	save_agent(agent2, path_2)
\ No newline at end of file
@@ -0,0 +1,285 @@
+# from keras.models import Sequential, model_from_json
+# from keras.layers.core import Dense, Dropout, Activation
+# from keras.optimizers import SGD
+# from keras.layers.advanced_activations import LeakyReLU
+# import keras
+
+from tensorflow.keras.models import Sequential, model_from_json, clone_model
+from tensorflow.keras.layers import Dense, Dropout, Activation, LeakyReLU  
+from tensorflow.keras.layers import Conv2D, Reshape
+from tensorflow.keras.optimizers import SGD  
+import tensorflow.keras as keras
+import tensorflow as tf
+
+import numpy as np
+import pickle
+import random
+
+from profiling import NO_TIMER
+
+
+# seed Python, NumPy and TensorFlow (weight initializers, dropout) from one run seed;
+# deterministic also makes the TF ops themselves deterministic, at some speed cost
+def set_seed(seed, deterministic=False):
+	random.seed(seed)
+	np.random.seed(seed % 2**32)
+	tf.keras.utils.set_random_seed(seed % 2**32)
+	if deterministic:
+		tf.config.experimental.enable_op_determinism()
+
+
+# an independent seed for the run identified by keys (e.g. a preset index)
+def derive_seed(seed, *keys):
+	return int(np.random.SeedSequence([seed] + list(keys)).generate_state(1)[0])
+
+
+def init_agent(hidden_size, layers, lr=1e-3, width=20, alpha=0.1, moment=0.9, loss='mse'):
+	model = Sequential()
+	# model.add(Dense(2 * width**2, init='lecun_uniform', input_shape=(2 * width**2,)))
+	model.add(Dense(2 * width**2, kernel_initializer='lecun_uniform', input_shape=(2 * width**2,)))
+	model.add(LeakyReLU(alpha=alpha))
+
+	for i in range(layers):
+		# model.add(Dense(hidden_size, init='lecun_uniform'))
+		model.add(Dense(hidden_size, kernel_initializer='lecun_uniform'))
+		model.add(LeakyReLU(alpha=alpha))
+		model.add(Dropout(0.2))
+
+	# linear output layer to generate real-valued outputs
+	# model.add(Dense(width**2, init='lecun_uniform'))
+	model.add(Dense(width**2, kernel_initializer='lecun_uniform'))	
+	model.add(Activation('linear'))
+
+	# opt = SGD(lr=lr, momentum=moment, decay=1e-18, clipnorm=1.)
+	opt = SGD(learning_rate=lr, momentum=moment, clipnorm=1.)
+	model.compile(loss=loss, optimizer=opt)
+
+	return model
+
+
+# fully convolutional Q-network: the same weights work for any board width
+def init_conv_agent(filters, layers, lr=1e-3, kernel_size=3, alpha=0.1, moment=0.9, loss='mse'):
+	model = Sequential()
+	model.add(Conv2D(filters, kernel_size, padding='same', kernel_initializer='lecun_uniform',
+					 input_shape=(None, None, 2)))
+	model.add(LeakyReLU(alpha=alpha))
+
+	for i in range(layers):
+		model.add(Conv2D(filters, kernel_size, padding='same', kernel_initializer='lecun_uniform'))
+		model.add(LeakyReLU(alpha=alpha))
+
+	# one linear Q value per cell, flattened row by row like the dense output
+	model.add(Conv2D(1, 1, kernel_initializer='lecun_uniform'))
+	model.add(Reshape((-1,)))
+
+	opt = SGD(learning_rate=lr, momentum=moment, clipnorm=1.)
+	model.compile(loss=loss, optimizer=opt)
+
+	return model
+
+
+# reshape board state(s) into the input layout the agent network expects
+def agent_input(agent, state):
+	if len(agent.input_shape) == 4:
+		return state.reshape((-1,) + state.shape[-3:])
+	return state.reshape(-1, int(np.prod(state.shape[-3:])))
+
+
+# save the agent network's parameters and architecture
+def save_agent(agent, filename):
+	json_model = agent.to_json()
+	weights = agent.get_weights()
+	with open(filename, 'wb') as fout:
+		pickle.dump([json_model, weights], fout, pickle.HIGHEST_PROTOCOL)
+
+
+# load the agent network's parameters and architecture
+def load_agent(filename, lr=1e-3, moment=0.9):
+	with open(filename, 'rb') as fin:
+		json_model, weights = pickle.load(fin)
+
+	agent = model_from_json(json_model)
+	agent.set_weights(weights)
+	# opt = SGD(lr=lr, momentum=moment, decay=1e-18, nesterov=False)
+	opt = SGD(learning_rate=lr, momentum=moment, nesterov=False)
+	agent.compile(loss='mse', optimizer=opt)
+
+	return agent
+
+
+# load the agent network for inference only: no optimizer is built or compiled
+def load_inference_agent(filename):
+	with open(filename, 'rb') as fin:
+		json_model, weights = pickle.load(fin)
+
+	agent = model_from_json(json_model)
+	agent.set_weights(weights)
+
+	return agent
+
+
+"""
+	Frozen copy of an agent used to score the bootstrap targets.
+	Its weights only change on sync.
+"""
+class TargetNetwork(object):
+	def __init__(self, agent):
+		self.model = clone_model(agent)
+		self.model.set_weights(agent.get_weights())
+
+	def predict(self, x):
+		return np.asarray(self.model.predict_on_batch(x))
+
+	# tau = 1 copies the online weights, tau < 1 does a Polyak (soft) update
+	def sync(self, agent, tau=1.):
+		if tau >= 1.:
+			self.model.set_weights(agent.get_weights())
+		else:
+			self.model.set_weights([tau * w + (1. - tau) * t for w, t in
+									zip(agent.get_weights(), self.model.get_weights())])
+
+
+"""
+	Compute Q values of each possible move, for a batch of moves given by
+	the states they led to (new_state: (B, width, width, 2)) and their
+	available cells (new_available: (B, width, width)).
+	1st Q - to suppress the opponent; 2nd Q - max self Q in the next turn
+	With target networks (Double DQN) the online agents pick the moves
+	and the targets score them. Each network runs one forward pass per batch.
+"""
+def compute_Q(agents, player, new_state, new_available, targets=None):
+	width = new_available.shape[-1]
+	rows = np.arange(len(new_state))
+	available = new_available.reshape(-1, width**2)
+
+	# suppress rival: take the move minimizing rival's max possible Q values
+	rival_Q = np.asarray(agents[1 - player].predict_on_batch(agent_input(agents[1 - player], new_state)))
+	newQ = available - rival_Q
+	if targets is None:
+		maxQ = np.max(newQ, axis=1)
+	else:
+		index = np.argmax(newQ, axis=1)
+		target_Q = targets[1 - player].predict(agent_input(agents[1 - player], new_state))
+		maxQ = available[rows, index] - target_Q[rows, index]
+
+	# rival's reaction: assume would choose the move with max Q values
+	# (make_move on every board of the batch at once)
+	rival_action = np.argmax(rival_Q + available, axis=1)
+	further_state = new_state.reshape(-1, width**2, 2).copy()
+	further_state[rows, rival_action, 1 - player] = 2 - player
+	further_state = further_state.reshape(new_state.shape)
+	further_avai = available.copy()
+	further_avai[rows, rival_action] = float("-inf")
+
+	# the agent's decision: the move with max "further" Q values
+	further_Q = np.asarray(agents[player].predict_on_batch(agent_input(agents[player], further_state)))
+	if targets is None:
+		max_furtherQ = np.max(further_Q + further_avai, axis=1)
+	else:
+		index = np.argmax(further_Q + further_avai, axis=1)
+		target_Q = targets[player].predict(agent_input(agents[player], further_state))
+		max_furtherQ = target_Q[rows, index] + further_avai[rows, index]
+
+	return maxQ, max_furtherQ
+
+
+"""
+	Compute the target outputs y of the deep Q-network for a batch of moves
+	The policy: balance between minimizing rival's Q (gamma)
+				and maximize self's max Q in the next turn (gamma2)
+	qvals are the agent's current Q values of the states, shape (B, width ** 2);
+	actions are flat move indices and terminal marks moves that ended the game
+"""
+def compute_labels(qvals, actions, rewards, maxQ, max_furtherQ, terminal, gamma, gamma2):
+	# the game proceeds - use the policy to compute y of the move
+	update = np.clip(rewards + (gamma * maxQ) + (gamma2 * max_furtherQ), -1000, 1000)
+	# the game terminates - y is just the reward itself
+	update = np.where(terminal, rewards, update)
+
+	# calculate the labels of the moves
+	y = np.array(qvals)
+	y[np.arange(len(actions)), actions] = update
+
+	return y
+
+
+"""
+	Memory of one agent's moves for experience replay.
+	Moves are kept unlabelled, with the board each one led to, so that the
+	labels and the bootstrap Q values are computed from fresh Q values
+	when a minibatch is replayed.
+"""
+class ReplayBuffer(object):
+	def __init__(self, buffersize, input_shape, width):
+		self.X = np.zeros((buffersize,) + tuple(input_shape))
+		self.actions = np.zeros(buffersize, dtype=np.int64)
+		self.rewards = np.zeros(buffersize)
+		self.next_state = np.zeros((buffersize, width, width, 2))
+		self.next_available = np.zeros((buffersize, width, width))
+		self.terminal = np.zeros(buffersize, dtype=bool)
+		self.size = 0
+		self.running = 0
+
+	def full(self):
+		return self.size == len(self.X)
+
+	def add(self, X, action, reward, next_state, next_available, terminal):
+		if not self.full():
+			i = self.size
+			self.size += 1
+		else:
+			# replace the old experience with the newest one
+			self.running = (self.running + 1) % len(self.X)
+			i = self.running
+
+		self.X[i] = X
+		self.actions[i] = action
+		self.rewards[i] = reward
+		self.next_state[i] = next_state
+		self.next_available[i] = next_available
+		self.terminal[i] = terminal
+
+	def sample(self, batchsize):
+		i = np.random.choice(self.size, batchsize, replace=False)
+		return (self.X[i], self.actions[i], self.rewards[i],
+				self.next_state[i], self.next_available[i], self.terminal[i])
+
+
+"""
+	Use experience replay (like minibatch updating)
+	to avoid catastrophic forgetting
+	Storing the move is timed as check_exp, drawing the minibatch as sample
+"""
+def check_exp(agent_exps, player, transition, batchsize, timer=NO_TIMER):
+	# store the experience; nothing is replayed until the memory is full
+	memory = agent_exps[player]
+	full = memory.full()
+	with timer('check_exp'):
+		memory.add(*transition)
+	if not full:
+		return None
+
+	# the memory is full
+	# sampling a subset of the stored experience to update the agent
+	with timer('sample'):
+		return memory.sample(batchsize)
+
+
+"""
+	Label a replayed minibatch of agents[player] with the agents' current
+	Q values and fit it. The bootstrap values of the moves that did not end
+	the game are computed here, in one batch, from the boards they led to.
+"""
+def replay(agents, player, minibatch, gamma, gamma2, batchsize, targets=None, verbose=0, timer=NO_TIMER):
+	X_train, actions, rewards, next_state, next_available, terminal = minibatch
+	agent = agents[player]
+	with timer('compute_Q'):
+		maxQ, max_furtherQ = np.zeros(len(actions)), np.zeros(len(actions))
+		live = ~terminal
+		if live.any():
+			maxQ[live], max_furtherQ[live] = compute_Q(agents, player, next_state[live],
+													   next_available[live], targets)
+		y_train = compute_labels(agent.predict_on_batch(X_train), actions, rewards,
+								 maxQ, max_furtherQ, terminal, gamma, gamma2)
+	with timer('fit'):
+		agent.fit(X_train, y_train, batch_size=batchsize, epochs=1, verbose=verbose)